@@ -8,6 +8,28 @@ import sys
 import os
 from pathlib import Path
 
+# orjson is optional - fall back to stdlib json if not installed
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def _loads(raw: bytes):
+    """Parse JSON bytes, preferring orjson when available"""
+    if HAS_ORJSON:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _dumps(obj) -> str:
+    """Serialize to a JSON string, preferring orjson when available"""
+    if HAS_ORJSON:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+
 def main():
     # Get project directory
     project_dir = os.environ.get('CLAUDE_PROJECT_DIR', '')
@@ -29,31 +51,41 @@ def main():
 
     pending_alerts = []
 
+    # One directory listing instead of probing each alert path separately
+    try:
+        with os.scandir(project_path) as it:
+            present = {entry.name: entry.path for entry in it if entry.is_file()}
+    except OSError:
+        sys.exit(0)
+
     for filename, alert_type in alert_files:
-        filepath = project_path / filename
-        if filepath.exists():
-            try:
-                with open(filepath, 'r') as f:
-                    data = json.load(f)
-
-                if data.get('status') == 'pending':
-                    alert_info = {
-                        'type': data.get('alert_type', alert_type),
-                        'timestamp': data.get('timestamp', 'unknown'),
-                        'reason': data.get('reason', 'Review needed'),
-                    }
-
-                    # Add specific details based on alert type
-                    if 'sold_position' in data:
-                        alert_info['sold_position'] = data['sold_position']
-                    if 'current_vix' in data:
-                        alert_info['vix'] = data['current_vix']
-                    if 'vix_regime' in data:
-                        alert_info['regime'] = data['vix_regime']
-
-                    pending_alerts.append(alert_info)
-            except Exception as e:
-                pass  # Silently ignore parse errors
+        if filename not in present:
+            continue
+
+        try:
+            # Single read instead of exists() + open() + buffered json.load()
+            data = _loads(Path(present[filename]).read_bytes())
+        except FileNotFoundError:
+            continue  # Removed between scan and read
+        except Exception:
+            continue  # Silently ignore read/parse errors
+
+        if isinstance(data, dict) and data.get('status') == 'pending':
+            alert_info = {
+                'type': data.get('alert_type', alert_type),
+                'timestamp': data.get('timestamp', 'unknown'),
+                'reason': data.get('reason', 'Review needed'),
+            }
+
+            # Add specific details based on alert type
+            if 'sold_position' in data:
+                alert_info['sold_position'] = data['sold_position']
+            if 'current_vix' in data:
+                alert_info['vix'] = data['current_vix']
+            if 'vix_regime' in data:
+                alert_info['regime'] = data['vix_regime']
+
+            pending_alerts.append(alert_info)
 
     # If there are pending alerts, output context for Claude
     if pending_alerts:
@@ -64,7 +96,7 @@ def main():
                 "message": f"ATTENTION: {len(pending_alerts)} pending strategy review(s) require processing."
             }
         }
-        print(json.dumps(output))
+        print(_dumps(output))
 
     sys.exit(0)
 
@@ -20,60 +20,292 @@ Usage:
     )
 
 All functions automatically load environment variables from .env
+
+Price, technicals, sentiment and macro lookups are memoized in-process
+for a short TTL (see _DEFAULT_TTLS); call clear_cache() to force a refetch.
 """
 
 import os
-from typing import Dict, Optional
+import json
+import hashlib
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Optional, Union
 from dotenv import load_dotenv
 
+# orjson is optional - fall back to stdlib json if not installed
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+if TYPE_CHECKING:
+    import yfinance as yf
+
 # Load environment variables on import
 load_dotenv()
 
-# Import underlying modules
-import yfinance as yf
-from technical_indicators import analyze_technicals
-from news_sentiment import get_news_sentiment, analyze_news_sentiment
-from macro_agent import MacroAgent
-from order_executor import OrderExecutor
-from market_status import get_market_status as _get_market_status
-from portfolio_correlation import analyze_portfolio_correlation, get_portfolio_metrics
-from sector_allocation import analyze_sector_allocation, get_sector_allocation
+# Underlying modules (yfinance, pandas, numpy, Alpaca...) are imported inside
+# the functions that use them, so importing this module stays cheap and a
+# caller only pays for the tools it actually touches.
+
+# Names historically re-exported from the underlying modules
+_LAZY_EXPORTS = {
+    'analyze_technicals': 'technical_indicators',
+    'get_news_sentiment': 'news_sentiment',
+    'analyze_news_sentiment': 'news_sentiment',
+    'MacroAgent': 'macro_agent',
+    'OrderExecutor': 'order_executor',
+    'analyze_portfolio_correlation': 'portfolio_correlation',
+    'get_portfolio_metrics': 'portfolio_correlation',
+    'analyze_sector_allocation': 'sector_allocation',
+    'get_sector_allocation': 'sector_allocation',
+}
+
+
+def __getattr__(name: str):
+    """Resolve re-exported names on first access (PEP 562)."""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+# =============================================================================
+# In-memory TTL cache
+# =============================================================================
+
+# Default time-to-live (seconds) per cached getter. Override with
+# AUTOINV_CACHE_TTL_<NAME>, e.g. AUTOINV_CACHE_TTL_PRICE=10. A TTL of 0 disables caching.
+_DEFAULT_TTLS = {
+    'PRICE': 30,
+    'TECHNICALS': 300,
+    'SENTIMENT': 900,
+    'MACRO_REGIME': 1800,
+}
+
+_cache: Dict[tuple, tuple] = {}
+_cache_lock = threading.Lock()
+
+
+def _copy_result(value):
+    """Shallow copy of a mutable (dict/list) cached result, else the value itself."""
+    return value.copy() if isinstance(value, (dict, list)) else value
+
+
+def _ttl_cache(name: str):
+    """
+    Memoize a getter for a configurable number of seconds.
+
+    Results containing an 'error' key are never cached so transient
+    failures are retried on the next call. Callers get a shallow copy of
+    dict/list results, so adding or replacing top-level keys doesn't leak
+    into the cached entry.
+    """
+    ttl = float(os.getenv(f'AUTOINV_CACHE_TTL_{name}', _DEFAULT_TTLS[name]))
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if ttl <= 0:
+                return fn(*args, **kwargs)
+
+            key = (fn.__name__, args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            with _cache_lock:
+                hit = _cache.get(key)
+            if hit is not None and now - hit[0] < ttl:
+                return _copy_result(hit[1])
+
+            value = fn(*args, **kwargs)
+            if not (isinstance(value, dict) and 'error' in value):
+                with _cache_lock:
+                    _cache[key] = (now, value)
+                return _copy_result(value)
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+def clear_cache() -> None:
+    """Drop all memoized API results (in-memory and on-disk)."""
+    with _cache_lock:
+        _cache.clear()
+    with _tickers_lock:
+        _tickers.clear()
+    if _CACHE_DIR.exists():
+        for entry in _CACHE_DIR.glob('*.json'):
+            try:
+                entry.unlink()
+            except OSError:
+                pass
+
+
+# =============================================================================
+# Shared yfinance Ticker objects
+# =============================================================================
+
+# Ticker instances memoize their quote data, so they are recycled after a
+# short age rather than kept forever.
+_TICKER_MAX_AGE = 60
+
+_tickers: Dict[str, tuple] = {}
+_tickers_lock = threading.Lock()
+
+
+def _ticker(symbol: str) -> 'yf.Ticker':
+    """Return a reusable yf.Ticker for symbol (recreated after _TICKER_MAX_AGE seconds)."""
+    import yfinance as yf
+
+    symbol = symbol.upper()
+    now = time.monotonic()
+    with _tickers_lock:
+        hit = _tickers.get(symbol)
+        if hit is not None and now - hit[0] < _TICKER_MAX_AGE:
+            return hit[1]
+        stock = yf.Ticker(symbol)
+        _tickers[symbol] = (now, stock)
+        return stock
+
+
+# =============================================================================
+# JSON file helpers
+# =============================================================================
+
+def _read_json_fast(path: Union[str, Path]) -> Any:
+    """
+    Read and parse a JSON file with a single read call.
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: If the contents are not valid JSON
+    """
+    raw = Path(path).read_bytes()
+    if HAS_ORJSON:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _write_json_fast(path: Union[str, Path], obj: Any) -> None:
+    """
+    Atomically write obj as indented JSON.
+
+    The document is written to a sibling .tmp file in one call and then
+    renamed over the target, so readers (e.g. the pending-review hook) never
+    see a partially written file. Non-JSON types are stringified.
+    """
+    path = Path(path)
+    if HAS_ORJSON:
+        try:
+            data = orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+        except TypeError:
+            data = json.dumps(obj, indent=2, default=str).encode()
+    else:
+        data = json.dumps(obj, indent=2, default=str).encode()
+
+    tmp = path.with_suffix('.tmp')
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+# =============================================================================
+# On-disk cache (survives restarts, for slow-moving data)
+# =============================================================================
+
+# Own subdirectory so clear_cache() only touches these files, not the other
+# modules' caches under .cache/ (backtest prices, ticker sectors, ...)
+_CACHE_DIR = Path(__file__).parent / '.cache' / 'api'
+
 
+def _disk_cache(name: str, ttl: int):
+    """
+    Persist a getter's result as JSON for ``ttl`` seconds.
 
-def get_stock_price(ticker: str) -> Dict:
+    Each distinct argument set gets its own file under .cache/api/. Freshness is
+    judged from the file mtime; writes are atomic (see _write_json_fast).
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = json.dumps([args, kwargs], sort_keys=True, default=str)
+            digest = hashlib.sha1(key.encode()).hexdigest()[:12]
+            path = _CACHE_DIR / f'{name}_{digest}.json'
+
+            try:
+                if time.time() - os.stat(path).st_mtime < ttl:
+                    return _read_json_fast(path)
+            except (OSError, ValueError):
+                pass
+
+            value = fn(*args, **kwargs)
+            if isinstance(value, dict) and 'error' not in value:
+                try:
+                    _CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                    _write_json_fast(path, value)
+                except OSError:
+                    pass
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+@_ttl_cache('PRICE')
+def get_stock_price(ticker: str, include_fundamentals: bool = False) -> Dict:
     """
     Get current stock price and key metrics.
 
     Args:
         ticker: Stock symbol (e.g., 'AAPL')
+        include_fundamentals: Also fetch pe_ratio and dividend_yield. These
+            need the full (slow) quote summary, so they are None by default.
 
     Returns:
         Dict with keys: ticker, price, volume, change_pct,
-                       high_52w, low_52w, market_cap
+                       high_52w, low_52w, market_cap, pe_ratio, dividend_yield
     """
     try:
-        stock = yf.Ticker(ticker)
-        info = stock.info
+        stock = _ticker(ticker)
+        # fast_info is served from the lightweight chart endpoint
+        fi = stock.fast_info
 
-        price = info.get('currentPrice') or info.get('regularMarketPrice', 0)
-        prev_close = info.get('previousClose', price)
+        price = fi.last_price or 0
+        prev_close = fi.previous_close or price
         change_pct = ((price - prev_close) / prev_close * 100) if prev_close else 0
 
+        pe_ratio = dividend_yield = None
+        if include_fundamentals:
+            info = stock.info
+            pe_ratio = info.get('trailingPE')
+            dividend_yield = info.get('dividendYield')
+
         return {
             'ticker': ticker,
             'price': price,
-            'volume': info.get('volume', 0),
+            'volume': fi.last_volume or 0,
             'change_pct': round(change_pct, 2),
-            'high_52w': info.get('fiftyTwoWeekHigh', 0),
-            'low_52w': info.get('fiftyTwoWeekLow', 0),
-            'market_cap': info.get('marketCap', 0),
-            'pe_ratio': info.get('trailingPE'),
-            'dividend_yield': info.get('dividendYield'),
+            'high_52w': fi.year_high or 0,
+            'low_52w': fi.year_low or 0,
+            'market_cap': fi.market_cap or 0,
+            'pe_ratio': pe_ratio,
+            'dividend_yield': dividend_yield,
         }
     except Exception as e:
         return {'error': str(e), 'ticker': ticker}
 
 
+@_ttl_cache('TECHNICALS')
 def get_technicals(ticker: str) -> Dict:
     """
     Get technical analysis for a stock.
@@ -86,6 +318,8 @@ def get_technicals(ticker: str) -> Dict:
                        sma50, sma50_distance, bullish_pct, details
     """
     try:
+        from technical_indicators import analyze_technicals
+
         result = analyze_technicals(ticker)
         raw = result.get('raw_data', {})
         overall = raw.get('overall_signal', {})
@@ -117,6 +351,7 @@ def get_technicals(ticker: str) -> Dict:
         return {'error': str(e), 'ticker': ticker}
 
 
+@_ttl_cache('SENTIMENT')
 def get_sentiment(ticker: str, days: int = 7) -> Dict:
     """
     Get news sentiment analysis for a stock.
@@ -130,6 +365,8 @@ def get_sentiment(ticker: str, days: int = 7) -> Dict:
                        articles_count, headlines
     """
     try:
+        from news_sentiment import get_news_sentiment
+
         result = get_news_sentiment(ticker, days=days)
 
         if 'error' in result:
@@ -156,6 +393,8 @@ def get_sentiment(ticker: str, days: int = 7) -> Dict:
         return {'error': str(e), 'ticker': ticker}
 
 
+@_ttl_cache('MACRO_REGIME')
+@_disk_cache('macro_regime', ttl=3600)
 def get_macro_regime() -> Dict:
     """
     Get current macro economic regime and risk assessment.
@@ -165,6 +404,8 @@ def get_macro_regime() -> Dict:
                        yield_curve, credit_spreads, recommendation
     """
     try:
+        from macro_agent import MacroAgent
+
         api_key = os.getenv('FRED_API_KEY')
         ma = MacroAgent(api_key=api_key)
         result = ma.get_market_regime()
@@ -199,6 +440,8 @@ def get_portfolio(mode: str = 'alpaca') -> Dict:
         Dict with keys: total_value, cash, equity, positions, pnl, pnl_pct
     """
     try:
+        from order_executor import OrderExecutor
+
         executor = OrderExecutor(mode=mode)
         result = executor.get_portfolio_summary()
 
@@ -236,6 +479,8 @@ def get_market_status() -> Dict:
                        market_open, next_trading_day
     """
     try:
+        from market_status import get_market_status as _get_market_status
+
         return _get_market_status()
     except Exception as e:
         return {'error': str(e)}
@@ -266,6 +511,8 @@ def execute_order(ticker: str, action: str, quantity: float,
         SHORT requires margin account with appropriate permissions.
     """
     try:
+        from order_executor import OrderExecutor
+
         executor = OrderExecutor(mode=mode)
         result = executor.execute_order(
             ticker=ticker,
@@ -290,26 +537,39 @@ def get_correlation(tickers: list, period: str = '1y') -> Dict:
         Dict with keys: diversification_score, avg_correlation,
                        high_correlation_pairs, stocks (metrics per ticker)
     """
+    if not tickers or len(tickers) < 2:
+        return {'error': 'Need at least 2 tickers for correlation analysis'}
+
     try:
+        import numpy as np
+        from portfolio_correlation import get_portfolio_metrics
+
         result = get_portfolio_metrics(tickers, period)
 
         if 'error' in result:
             return result
 
-        # Find high correlation pairs (>0.7)
+        # Find high correlation pairs (>0.7) over the upper triangle in one pass
         high_corr_pairs = []
         correlations = result.get('correlations', {})
         ticker_list = list(correlations.keys())
 
-        for i, t1 in enumerate(ticker_list):
-            for t2 in ticker_list[i+1:]:
-                if t1 in correlations and t2 in correlations.get(t1, {}):
-                    corr = correlations[t1][t2]
-                    if abs(corr) >= 0.7:
-                        high_corr_pairs.append({
-                            'pair': f"{t1}-{t2}",
-                            'correlation': round(corr, 3)
-                        })
+        if len(ticker_list) >= 2:
+            matrix = np.array([
+                [correlations[t1].get(t2, np.nan) for t2 in ticker_list]
+                for t1 in ticker_list
+            ], dtype=float)
+            rows, cols = np.triu_indices(len(ticker_list), k=1)
+            upper = matrix[rows, cols]
+            mask = np.abs(upper) >= 0.7  # NaN compares False
+
+            high_corr_pairs = [
+                {
+                    'pair': f"{ticker_list[i]}-{ticker_list[j]}",
+                    'correlation': round(float(corr), 3)
+                }
+                for i, j, corr in zip(rows[mask], cols[mask], upper[mask])
+            ]
 
         return {
             'tickers': tickers,
@@ -324,6 +584,7 @@ def get_correlation(tickers: list, period: str = '1y') -> Dict:
         return {'error': str(e)}
 
 
+@_disk_cache('sectors', ttl=86400)
 def get_sectors(tickers: list, weights: list = None) -> Dict:
     """
     Get sector allocation and concentration risk analysis.
@@ -337,6 +598,8 @@ def get_sectors(tickers: list, weights: list = None) -> Dict:
                        diversification_score, largest_sector
     """
     try:
+        from sector_allocation import get_sector_allocation
+
         result = get_sector_allocation(tickers, weights)
 
         if 'error' in result:
@@ -344,15 +607,17 @@ def get_sectors(tickers: list, weights: list = None) -> Dict:
 
         sector_exposure = result.get('sector_exposure', {})
 
-        # Find concentration risks (>30%)
-        concentration_risks = [
-            {'sector': sector, 'exposure': pct}
-            for sector, pct in sector_exposure.items()
-            if pct > 30 and sector != 'Unknown'
-        ]
+        # Find concentration risks (>30%) and the largest sector in one pass
+        concentration_risks = []
+        largest_sector = None
+        for sector, pct in sector_exposure.items():
+            if largest_sector is None or pct > largest_sector[1]:
+                largest_sector = (sector, pct)
+            if pct > 30 and sector != 'Unknown':
+                concentration_risks.append({'sector': sector, 'exposure': pct})
 
-        # Find largest sector
-        largest_sector = max(sector_exposure.items(), key=lambda x: x[1]) if sector_exposure else ('Unknown', 0)
+        if largest_sector is None:
+            largest_sector = ('Unknown', 0)
 
         return {
             'tickers': tickers,
@@ -379,14 +644,22 @@ def scan_technicals(tickers: list) -> list:
 
     Returns:
         List of dicts sorted by bullish_pct descending
+
+    Note:
+        Tickers are fetched concurrently (each lookup is network-bound).
+        Pool size defaults to 16 and can be overridden with the
+        AUTOINV_SCAN_WORKERS environment variable.
     """
-    results = []
-    for ticker in tickers:
-        result = get_technicals(ticker)
-        if 'error' not in result:
-            results.append(result)
+    if not tickers:
+        return []
+
+    max_workers = int(os.getenv('AUTOINV_SCAN_WORKERS', '16'))
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tickers)))) as ex:
+        results = [r for r in ex.map(get_technicals, tickers) if 'error' not in r]
 
-    return sorted(results, key=lambda x: x.get('bullish_pct', 0), reverse=True)
+    # Successful get_technicals results always carry bullish_pct; sort in place
+    results.sort(key=itemgetter('bullish_pct'), reverse=True)
+    return results
 
 
 # Convenience aliases for common operations
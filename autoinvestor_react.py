@@ -8,23 +8,155 @@ Author: Lyra + Thomas Edrington
 Version: 1.0.0
 """
 
+import importlib.util
 import json
 import re
-from typing import Dict, List, Optional, Callable, Any
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Callable, Any, Tuple, Union
 from datetime import datetime
 import anthropic
 import yfinance as yf
 import pandas as pd
+import numpy as np
+
+# orjson is optional - fall back to stdlib json if not installed
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# h2 is optional - enables HTTP/2 on the shared Anthropic connection pool.
+# Only its availability matters here, so probe for it without importing it.
+HAS_H2 = importlib.util.find_spec('h2') is not None
+
+
+# Maximum concurrent tool calls for a batched Action Input
+MAX_BATCH_WORKERS = 8
+
+# Characters of each observation echoed to the console in verbose mode
+OBSERVATION_PREVIEW_CHARS = 500
+
+# Characters of each observation re-sent to the model in later iterations.
+# Every iteration's prompt repeats the whole history, so long tool output
+# (e.g. full financial statements) would otherwise be paid for again on
+# every step.
+OBSERVATION_PROMPT_CHARS = 1000
+
+# ReAct response patterns, compiled once at import
+_THOUGHT_RE = re.compile(r'Thought:\s*(.+?)(?=\nAction:|$)', re.DOTALL | re.IGNORECASE)
+_ACTION_RE = re.compile(r'Action:\s*(\w+)', re.IGNORECASE)
+_ACTION_INPUT_RE = re.compile(r'Action Input:\s*(.+?)(?=\n\n|$)', re.DOTALL | re.IGNORECASE)
+
+# Action Input helpers: ```json fences, and the common {"key": "value"} shape
+_CODE_FENCE_RE = re.compile(r'^```(?:json)?\s*(.*?)\s*```', re.DOTALL | re.IGNORECASE)
+_SIMPLE_INPUT_RE = re.compile(r'^\{\s*"(\w+)"\s*:\s*"([^"\\]*)"\s*\}$')
+
+_json_decoder = json.JSONDecoder()
+
+# Lazily created process-wide HTTP client (see _get_http_client)
+_http_client = None
+_http_client_lock = threading.Lock()
+
+
+def _get_http_client():
+    """
+    Shared keep-alive HTTP client for Anthropic API calls
+
+    Agents are created per request (e.g. the desktop app), so sharing one
+    pool across them lets later agents reuse already-open TLS connections
+    instead of handshaking again.
+    """
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            # The SDK's default client already keeps connections alive with
+            # generous pool limits; what matters is that it is created once
+            _http_client = anthropic.DefaultHttpxClient(http2=HAS_H2)
+        return _http_client
+
+
+def _json_loads(text: str) -> Any:
+    """Parse JSON, preferring orjson when available"""
+    if HAS_ORJSON:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _parse_action_input(text: str) -> Any:
+    """
+    Parse a tool's Action Input into JSON.
+
+    Handles the shapes Claude actually emits: fenced ```json blocks and
+    trailing commentary after the JSON value. Single-key string inputs
+    such as {"ticker": "AAPL"} skip the JSON parser entirely.
+
+    Raises:
+        json.JSONDecodeError: If no JSON value can be extracted
+    """
+    text = text.strip()
+
+    fence = _CODE_FENCE_RE.match(text)
+    if fence:
+        text = fence.group(1)
+
+    simple = _SIMPLE_INPUT_RE.match(text)
+    if simple:
+        return {simple.group(1): simple.group(2)}
+
+    try:
+        return _json_loads(text)
+    except json.JSONDecodeError:
+        # Tolerate prose before/after the JSON value
+        starts = [i for i in (text.find('{'), text.find('[')) if i != -1]
+        if not starts:
+            raise
+        value, _ = _json_decoder.raw_decode(text, min(starts))
+        return value
+
+
+def _json_dumps_compact(obj: Any) -> str:
+    """Serialize to single-line JSON, preferring orjson when available"""
+    if HAS_ORJSON:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+        except TypeError:
+            pass
+    return json.dumps(obj)
+
+
+def _json_dumps_pretty(obj: Any) -> str:
+    """Serialize to indented JSON, preferring orjson when available"""
+    if HAS_ORJSON:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY).decode()
+        except TypeError:
+            pass  # Types orjson can't encode (e.g. non-str keys) - use stdlib
+    return json.dumps(obj, indent=2)
+
+
+# Tool parameter spec: {name: description}, or the same as (name, description)
+# pairs so callers can share immutable module-level constants
+ToolParameters = Union[Dict[str, str], Tuple[Tuple[str, str], ...]]
 
 
 class Tool:
     """Base class for tools the ReAct agent can use"""
 
-    def __init__(self, name: str, description: str, parameters: Dict, function: Callable):
+    def __init__(self, name: str, description: str, parameters: ToolParameters, function: Callable):
         self.name = name
         self.description = description
         self.parameters = parameters
         self.function = function
+        # Prompt block rendered once here instead of on every prompt build
+        self._rendered = f"""
+{name}:
+  Description: {description}
+  Parameters: {json.dumps(dict(parameters), indent=2)}
+"""
 
     def execute(self, **kwargs) -> Dict[str, Any]:
         """Execute the tool with given parameters"""
@@ -45,7 +177,7 @@ class Tool:
         return {
             "name": self.name,
             "description": self.description,
-            "parameters": self.parameters
+            "parameters": dict(self.parameters)
         }
 
 
@@ -54,10 +186,12 @@ class ToolRegistry:
 
     def __init__(self):
         self.tools: Dict[str, Tool] = {}
+        self._descriptions_cache: Optional[str] = None
 
     def register(self, tool: Tool):
         """Register a new tool"""
         self.tools[tool.name] = tool
+        self._descriptions_cache = None
         print(f"Registered tool: {tool.name}")
 
     def get(self, name: str) -> Optional[Tool]:
@@ -69,16 +203,10 @@ class ToolRegistry:
         return [tool.to_dict() for tool in self.tools.values()]
 
     def get_descriptions(self) -> str:
-        """Get formatted tool descriptions for prompt"""
-        descriptions = []
-        for tool in self.tools.values():
-            params = json.dumps(tool.parameters, indent=2)
-            descriptions.append(f"""
-{tool.name}:
-  Description: {tool.description}
-  Parameters: {params}
-""")
-        return "\n".join(descriptions)
+        """Get formatted tool descriptions for prompt (cached until next register)"""
+        if self._descriptions_cache is None:
+            self._descriptions_cache = "\n".join(tool._rendered for tool in self.tools.values())
+        return self._descriptions_cache
 
 
 class ReActAgent:
@@ -100,11 +228,47 @@ class ReActAgent:
             model: Claude model to use
             max_iterations: Maximum reasoning loops before timeout
         """
-        self.client = anthropic.Anthropic(api_key=api_key)
+        self.client = anthropic.Anthropic(api_key=api_key, http_client=_get_http_client())
         self.model = model
         self.max_iterations = max_iterations
         self.tools = ToolRegistry()
-        self.history = []
+        self._reset_history()
+
+        # Incremental prompt-formatting state for self.history
+        self._history_ref = self.history
+        self._history_lines: List[str] = []
+        self._history_formatted = 0
+
+    def _reset_history(self):
+        """
+        Start an empty history for a new run
+
+        self.history keeps every entry in order (prompt formatting and the
+        returned result need the interleaving). The per-type lists hold the
+        same data column-wise so consumers that want one kind of entry
+        iterate it directly instead of filtering history by type:
+        thoughts (iteration, content), actions (iteration, tool, input),
+        observations (iteration, content).
+        """
+        self.history: List[Dict] = []
+        self.thoughts: List[tuple] = []
+        self.actions: List[tuple] = []
+        self.observations: List[tuple] = []
+
+    def _record_thought(self, iteration: int, thought: str):
+        """Append a thought to the history"""
+        self.history.append({"type": "thought", "content": thought, "iteration": iteration})
+        self.thoughts.append((iteration, thought))
+
+    def _record_action(self, iteration: int, tool: str, tool_input: str):
+        """Append a tool call to the history"""
+        self.history.append({"type": "action", "tool": tool, "input": tool_input, "iteration": iteration})
+        self.actions.append((iteration, tool, tool_input))
+
+    def _record_observation(self, iteration: int, observation: str):
+        """Append a tool result to the history"""
+        self.history.append({"type": "observation", "content": observation, "iteration": iteration})
+        self.observations.append((iteration, observation))
 
     def _build_system_prompt(self) -> str:
         """Build system prompt with tool descriptions"""
@@ -139,6 +303,10 @@ Thought: [Your analysis of the observation]
 Action: [next tool_name or FINAL_ANSWER]
 Action Input: [parameters or your final recommendation]
 
+When you need several independent lookups, run them in parallel in one step:
+Action: BATCH
+Action Input: [{{"tool": "tool_name", "input": {{...}}}}, {{"tool": "other_tool", "input": {{...}}}}]
+
 When you have enough information, use:
 Action: FINAL_ANSWER
 Action Input: [Your complete investment recommendation]
@@ -158,9 +326,9 @@ Begin your research now.
         Returns:
             (thought, action, action_input)
         """
-        thought_match = re.search(r'Thought:\s*(.+?)(?=\nAction:|$)', response, re.DOTALL | re.IGNORECASE)
-        action_match = re.search(r'Action:\s*(\w+)', response, re.IGNORECASE)
-        action_input_match = re.search(r'Action Input:\s*(.+?)(?=\n\n|$)', response, re.DOTALL | re.IGNORECASE)
+        thought_match = _THOUGHT_RE.search(response)
+        action_match = _ACTION_RE.search(response)
+        action_input_match = _ACTION_INPUT_RE.search(response)
 
         thought = thought_match.group(1).strip() if thought_match else None
         action = action_match.group(1).strip() if action_match else None
@@ -168,45 +336,166 @@ Begin your research now.
 
         return thought, action, action_input
 
+    @staticmethod
+    def _tool_call_complete(text: str) -> bool:
+        """
+        Check whether a partial response already holds a complete tool call.
+
+        A call is complete once the first Action Input block has been
+        terminated by a blank line - _parse_response ignores anything after
+        that point. FINAL_ANSWER is never treated as complete so the full
+        recommendation is always received.
+        """
+        input_pos = text.find("Action Input:")
+        if input_pos == -1:
+            return False
+
+        action_match = _ACTION_RE.search(text, 0, input_pos)
+        if not action_match or action_match.group(1).upper() == "FINAL_ANSWER":
+            return False
+
+        # Skip leading whitespace the same way the Action Input regex does
+        body_start = input_pos + len("Action Input:")
+        while body_start < len(text) and text[body_start].isspace():
+            body_start += 1
+        return body_start < len(text) and text.find("\n\n", body_start) != -1
+
+    def _get_response(self, system_prompt: str, user_prompt: str) -> str:
+        """
+        Stream a response from Claude.
+
+        Parsing overlaps with generation: as soon as a complete tool call
+        has arrived the stream is closed, so trailing text the model would
+        otherwise generate after the Action Input is never waited for.
+        """
+        text = ""
+        checked_upto = 0
+
+        with self.client.messages.stream(
+            model=self.model,
+            max_tokens=2000,
+            system=system_prompt,
+            messages=[
+                {"role": "user", "content": user_prompt}
+            ]
+        ) as stream:
+            for chunk in stream.text_stream:
+                text += chunk
+                # Only re-check when a new line break could have completed the block
+                if "\n" in text[checked_upto:] and self._tool_call_complete(text):
+                    break
+                checked_upto = len(text)
+
+        return text
+
     def _execute_tool(self, tool_name: str, tool_input: str) -> str:
-        """Execute a tool and return observation"""
+        """
+        Execute a tool and return observation
+
+        A JSON array in Action Input is treated as a batch and dispatched
+        concurrently (see _execute_batch).
+        """
+        try:
+            # Parse JSON input
+            params = _parse_action_input(tool_input)
+        except json.JSONDecodeError as e:
+            return f"ERROR: Invalid JSON in Action Input: {e}"
+
+        if isinstance(params, list):
+            return self._execute_batch(tool_name, params)
+
+        return self._execute_single(tool_name, params)
+
+    def _execute_single(self, tool_name: str, params: Any) -> str:
+        """Execute one tool call with already-parsed parameters"""
         tool = self.tools.get(tool_name)
 
         if not tool:
             return f"ERROR: Tool '{tool_name}' not found. Available tools: {', '.join(self.tools.tools.keys())}"
 
-        try:
-            # Parse JSON input
-            params = json.loads(tool_input)
+        if not isinstance(params, dict):
+            return "ERROR: Action Input must be a JSON object"
 
+        try:
             # Execute tool
             result = tool.execute(**params)
 
             if result["success"]:
-                return json.dumps(result["data"], indent=2)
+                return _json_dumps_pretty(result["data"])
             else:
                 return f"ERROR: {result['error']}"
 
-        except json.JSONDecodeError as e:
-            return f"ERROR: Invalid JSON in Action Input: {e}"
         except Exception as e:
             return f"ERROR: Tool execution failed: {e}"
 
+    def _execute_batch(self, tool_name: str, calls: List[Any]) -> str:
+        """
+        Execute several independent tool calls concurrently.
+
+        With Action BATCH each entry is {"tool": name, "input": {...}};
+        with a regular tool name each entry is that tool's parameters.
+        Tools are network-bound, so wall time is roughly the slowest call.
+        """
+        if not calls:
+            return "ERROR: Empty batch in Action Input"
+
+        if tool_name.upper() == "BATCH":
+            jobs = []
+            for call in calls:
+                if not isinstance(call, dict) or "tool" not in call:
+                    return 'ERROR: BATCH entries must look like {"tool": "name", "input": {...}}'
+                jobs.append((call["tool"], call.get("input", {})))
+        else:
+            jobs = [(tool_name, call) for call in calls]
+
+        with ThreadPoolExecutor(max_workers=min(MAX_BATCH_WORKERS, len(jobs))) as ex:
+            observations = list(ex.map(lambda job: self._execute_single(*job), jobs))
+
+        return "\n\n".join(
+            f"[{i + 1}] {name} {_json_dumps_compact(params)}:\n{observation}"
+            for i, ((name, params), observation) in enumerate(zip(jobs, observations))
+        )
+
+    @staticmethod
+    def _format_history_item(item: Dict) -> List[str]:
+        """Format a single history entry as prompt lines"""
+        if item["type"] == "thought":
+            return [f"\nIteration {item['iteration'] + 1}:", f"Thought: {item['content']}"]
+        elif item["type"] == "action":
+            return [f"Action: {item['tool']}", f"Action Input: {item['input']}"]
+        elif item["type"] == "observation":
+            content = item['content']
+            if len(content) > OBSERVATION_PROMPT_CHARS:
+                content = content[:OBSERVATION_PROMPT_CHARS] + "\n... [truncated]"
+            return [f"Observation: {content}"]
+        return []
+
     def _format_history_for_prompt(self) -> str:
-        """Format conversation history for prompt"""
-        formatted = []
+        """
+        Format conversation history for prompt
+
+        Lines are formatted incrementally: only entries appended since the
+        previous call are formatted, so a run costs O(n) formatting work
+        instead of re-formatting the whole history every iteration.
+        """
+        # History list was replaced (new run) or truncated - start over
+        if self._history_ref is not self.history or self._history_formatted > len(self.history):
+            self._history_ref = self.history
+            self._history_lines = []
+            self._history_formatted = 0
+
+        for item in self.history[self._history_formatted:]:
+            self._history_lines.extend(self._format_history_item(item))
+        self._history_formatted = len(self.history)
 
-        for i, item in enumerate(self.history):
-            if item["type"] == "thought":
-                formatted.append(f"\nIteration {item['iteration'] + 1}:")
-                formatted.append(f"Thought: {item['content']}")
-            elif item["type"] == "action":
-                formatted.append(f"Action: {item['tool']}")
-                formatted.append(f"Action Input: {item['input']}")
-            elif item["type"] == "observation":
-                formatted.append(f"Observation: {item['content']}")
+        return "\n".join(self._history_lines)
 
-        return "\n".join(formatted)
+    @staticmethod
+    def _emit(lines: List[str]):
+        """Write buffered console lines with a single write call and clear the buffer"""
+        if lines:
+            sys.stdout.write("\n".join(lines) + "\n")
+            lines.clear()
 
     def run(self, user_query: str, verbose: bool = True) -> Dict[str, Any]:
         """
@@ -219,17 +508,22 @@ Begin your research now.
         Returns:
             Dictionary with final answer and metadata
         """
-        self.history = []
+        self._reset_history()
+
+        # Console output is collected per step and written in one call
+        out: List[str] = []
 
         if verbose:
-            print(f"\n{'='*80}")
-            print(f"INVESTMENT RESEARCH QUERY: {user_query}")
-            print(f"{'='*80}\n")
+            out.append(f"\n{'='*80}")
+            out.append(f"INVESTMENT RESEARCH QUERY: {user_query}")
+            out.append(f"{'='*80}\n")
+            self._emit(out)
 
-        for iteration in range(self.max_iterations):
-            # Build prompt with system instructions and history
-            system_prompt = self._build_system_prompt()
+        # System prompt is invariant for the whole run
+        system_prompt = self._build_system_prompt()
 
+        for iteration in range(self.max_iterations):
+            # Build prompt with history
             if iteration == 0:
                 user_prompt = f"USER QUERY: {user_query}\n\nBegin your research:"
             else:
@@ -237,40 +531,28 @@ Begin your research now.
 
             # Get response from Claude
             if verbose:
-                print(f"\n--- Iteration {iteration + 1} ---")
+                out.append(f"\n--- Iteration {iteration + 1} ---")
 
-            message = self.client.messages.create(
-                model=self.model,
-                max_tokens=2000,
-                system=system_prompt,
-                messages=[
-                    {"role": "user", "content": user_prompt}
-                ]
-            )
-
-            response = message.content[0].text
+            response = self._get_response(system_prompt, user_prompt)
 
             # Parse response
             thought, action, action_input = self._parse_response(response)
 
             if verbose and thought:
-                print(f"\nThought: {thought}")
+                out.append(f"\nThought: {thought}")
 
             # Record thought
             if thought:
-                self.history.append({
-                    "type": "thought",
-                    "content": thought,
-                    "iteration": iteration
-                })
+                self._record_thought(iteration, thought)
 
             # Check if done
             if action and action.upper() == "FINAL_ANSWER":
                 if verbose:
-                    print(f"\n{'='*80}")
-                    print("FINAL ANSWER:")
-                    print(f"{'='*80}")
-                    print(f"\n{action_input}\n")
+                    out.append(f"\n{'='*80}")
+                    out.append("FINAL ANSWER:")
+                    out.append(f"{'='*80}")
+                    out.append(f"\n{action_input}\n")
+                    self._emit(out)
 
                 return {
                     "success": True,
@@ -282,34 +564,33 @@ Begin your research now.
             # Execute action
             if action and action_input:
                 if verbose:
-                    print(f"Action: {action}")
-                    print(f"Action Input: {action_input}")
+                    out.append(f"Action: {action}")
+                    out.append(f"Action Input: {action_input}")
+                    # Show the call before the (possibly slow) tool runs
+                    self._emit(out)
 
                 # Record action
-                self.history.append({
-                    "type": "action",
-                    "tool": action,
-                    "input": action_input,
-                    "iteration": iteration
-                })
+                self._record_action(iteration, action, action_input)
 
                 # Execute tool
                 observation = self._execute_tool(action, action_input)
 
                 if verbose:
-                    print(f"\nObservation: {observation[:500]}..." if len(observation) > 500 else f"\nObservation: {observation}")
+                    if len(observation) > OBSERVATION_PREVIEW_CHARS:
+                        observation_preview = observation[:OBSERVATION_PREVIEW_CHARS] + "..."
+                    else:
+                        observation_preview = observation
+                    out.append(f"\nObservation: {observation_preview}")
+                    self._emit(out)
 
                 # Record observation
-                self.history.append({
-                    "type": "observation",
-                    "content": observation,
-                    "iteration": iteration
-                })
+                self._record_observation(iteration, observation)
             else:
                 # No valid action found
                 if verbose:
-                    print(f"\nWARNING: Could not parse action from response:")
-                    print(response)
+                    out.append(f"\nWARNING: Could not parse action from response:")
+                    out.append(response)
+                    self._emit(out)
                 break
 
         # Max iterations reached
@@ -325,11 +606,45 @@ Begin your research now.
 # REAL YAHOO FINANCE TOOLS
 # ============================================================================
 
+# Seconds a Ticker and its info dict are reused across tools. Several tools
+# are usually called for the same ticker in one research run; without this
+# each one triggers its own full quote-summary scrape.
+INFO_CACHE_TTL = 300
+
+_ticker_cache: Dict[str, list] = {}
+_ticker_cache_lock = threading.Lock()
+
+
+def _get_ticker_entry(ticker: str) -> list:
+    """Return the cached [created, yf.Ticker, info-or-None] entry for ticker"""
+    ticker = ticker.upper()
+    now = time.monotonic()
+    with _ticker_cache_lock:
+        entry = _ticker_cache.get(ticker)
+        if entry is None or now - entry[0] >= INFO_CACHE_TTL:
+            # yf.Ticker memoizes info internally, so expiry means a new object
+            entry = [now, yf.Ticker(ticker), None]
+            _ticker_cache[ticker] = entry
+        return entry
+
+
+def _get_ticker(ticker: str) -> yf.Ticker:
+    """Shared yf.Ticker for ticker (recreated after INFO_CACHE_TTL seconds)"""
+    return _get_ticker_entry(ticker)[1]
+
+
+def _get_info(ticker: str) -> Dict:
+    """Ticker.info for ticker, fetched at most once per INFO_CACHE_TTL seconds"""
+    entry = _get_ticker_entry(ticker)
+    if entry[2] is None:
+        entry[2] = entry[1].info
+    return entry[2]
+
+
 def get_stock_price(ticker: str) -> Dict:
     """Get current stock price and trading data from Yahoo Finance"""
     try:
-        stock = yf.Ticker(ticker)
-        info = stock.info
+        info = _get_info(ticker)
 
         # Get current price
         current_price = info.get('currentPrice') or info.get('regularMarketPrice')
@@ -361,11 +676,7 @@ def get_stock_price(ticker: str) -> Dict:
 def get_company_financials(ticker: str, statement: str = "income") -> Dict:
     """Get company financial statements from Yahoo Finance"""
     try:
-        stock = yf.Ticker(ticker)
-        info = stock.info
-
-        # Get quarterly revenue data
-        quarterly_financials = stock.quarterly_financials
+        info = _get_info(ticker)
 
         financials = {
             "ticker": ticker,
@@ -391,11 +702,7 @@ def get_company_financials(ticker: str, statement: str = "income") -> Dict:
 def get_analyst_ratings(ticker: str) -> Dict:
     """Get analyst consensus ratings from Yahoo Finance"""
     try:
-        stock = yf.Ticker(ticker)
-        info = stock.info
-
-        # Get recommendations
-        recommendations = stock.recommendations
+        info = _get_info(ticker)
 
         # Parse recommendation consensus
         recommendation = info.get('recommendationKey', 'none')
@@ -426,8 +733,7 @@ def get_analyst_ratings(ticker: str) -> Dict:
 def calculate_valuation(ticker: str) -> Dict:
     """Calculate valuation metrics from Yahoo Finance data"""
     try:
-        stock = yf.Ticker(ticker)
-        info = stock.info
+        info = _get_info(ticker)
 
         return {
             "ticker": ticker,
@@ -449,8 +755,8 @@ def calculate_valuation(ticker: str) -> Dict:
 def risk_assessment(ticker: str) -> Dict:
     """Assess investment risk using Yahoo Finance data"""
     try:
-        stock = yf.Ticker(ticker)
-        info = stock.info
+        stock = _get_ticker(ticker)
+        info = _get_info(ticker)
 
         # Get historical data for volatility calculation
         hist = stock.history(period="1mo")
@@ -458,9 +764,11 @@ def risk_assessment(ticker: str) -> Dict:
         # Calculate 30-day volatility if we have data
         volatility_30d = 0
         if not hist.empty and 'Close' in hist.columns:
-            returns = hist['Close'].pct_change().dropna()
-            if len(returns) > 0:
-                volatility_30d = returns.std() * (252 ** 0.5)  # Annualized
+            closes = hist['Close'].to_numpy(dtype=float)
+            returns = np.diff(closes) / closes[:-1]
+            returns = returns[~np.isnan(returns)]
+            if len(returns) > 1:
+                volatility_30d = float(returns.std(ddof=1)) * (252 ** 0.5)  # Annualized
 
         # Get beta
         beta = info.get('beta', 1.0)
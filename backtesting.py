@@ -16,18 +16,287 @@ Version: 1.0.0 - 2025-11-25
 """
 
 import os
+import json
+import threading
+from pathlib import Path
 import yfinance as yf
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
-from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import warnings
 warnings.filterwarnings('ignore')
 
+# Optional progress bar for network fallbacks
+try:
+    from tqdm import tqdm
+    HAS_TQDM = True
+except ImportError:
+    HAS_TQDM = False
+
+# Optional JIT for the fused per-window statistics kernel
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+# Default number of tickers fetched concurrently when the bulk prefetch misses them
+DEFAULT_MAX_WORKERS = 16
+
+# Guards price_cache dicts shared between worker threads
+_price_cache_lock = threading.Lock()
+
+# yf.Ticker objects reused by fallback lookups; yfinance already keeps one
+# pooled HTTP session for all requests, so this only saves per-object setup
+_tickers: Dict[str, yf.Ticker] = {}
+_tickers_lock = threading.Lock()
+
+# Days either side of a target date searched for a trading day (weekends/holidays)
+PRICE_LOOKUP_SLACK_DAYS = 5
+
+# Bulk prefetch: tickers per yf.download call, and chunks downloaded at once
+PREFETCH_CHUNK_SIZE = 10
+PREFETCH_MAX_WORKERS = 8
+
+# Prefetched history for one ticker: (sorted datetime64 dates, float closes)
+PriceFrame = Tuple[np.ndarray, np.ndarray]
+
+# Persistent cache of resolved historical closes. Prices for dates older than
+# SETTLED_AFTER_DAYS never change, so they are kept without expiry and reused
+# by every later backtest run.
+PRICE_CACHE_PATH = Path(__file__).parent / '.cache' / 'backtest_prices.json'
+SETTLED_AFTER_DAYS = 7
+
+
+def parse_trade_dates(trades: List[Dict]) -> np.ndarray:
+    """
+    Parse every trade's transaction_date (YYYY-MM-DD) in one vectorized call
+
+    Returns:
+        datetime64[D] array aligned with trades; NaT where missing or invalid
+    """
+    dates = pd.to_datetime([t.get('transaction_date') for t in trades],
+                           format='%Y-%m-%d', errors='coerce', cache=True)
+    return dates.to_numpy(dtype='datetime64[D]')
+
+
+def trades_table(trades: List[Dict]) -> pd.DataFrame:
+    """
+    Lay trade dicts out column-wise once, so the backtest reads arrays
+    instead of looking up the same keys in every dict
+
+    Returns:
+        DataFrame aligned with trades: ticker, politician, transaction_date,
+        transaction_type (lowercased), tx_date (datetime64[D], NaT if invalid)
+        and boolean is_buy / is_sell columns
+    """
+    table = pd.DataFrame(trades, columns=['ticker', 'politician',
+                                          'transaction_date', 'transaction_type'])
+    table['politician'] = table['politician'].fillna('Unknown')
+    table['transaction_type'] = table['transaction_type'].fillna('').astype(str).str.lower()
+    table['tx_date'] = pd.to_datetime(table['transaction_date'], format='%Y-%m-%d',
+                                      errors='coerce', cache=True).to_numpy(dtype='datetime64[D]')
+    table['is_buy'] = table['transaction_type'].str.contains('buy|purchase', regex=True)
+    table['is_sell'] = table['transaction_type'].str.contains('sell|sale', regex=True)
+    return table
+
+
+def _needed_price_keys(ticker: str, tx_date: np.datetime64, windows: List[int],
+                       today: np.datetime64) -> List[str]:
+    """Cache keys (entry + past exit dates) a trade will look up"""
+    keys = [f"{ticker}_{tx_date}"]
+    for days in windows:
+        exit_date = tx_date + np.timedelta64(days, 'D')
+        if exit_date <= today:
+            keys.append(f"{ticker}_{exit_date}")
+    return keys
+
+
+def load_price_cache(path: Path = PRICE_CACHE_PATH) -> Dict[str, float]:
+    """Load the persistent price cache (empty dict if missing or unreadable)"""
+    try:
+        cache = json.loads(Path(path).read_bytes())
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def save_price_cache(price_cache: Dict[str, float], path: Path = PRICE_CACHE_PATH):
+    """
+    Persist settled prices from price_cache (atomic write)
+
+    Only prices for dates at least SETTLED_AFTER_DAYS old are written.
+    """
+    cutoff = (datetime.now() - timedelta(days=SETTLED_AFTER_DAYS)).strftime('%Y-%m-%d')
+    with _price_cache_lock:
+        settled = {
+            key: float(price) for key, price in price_cache.items()
+            if price is not None and key.rsplit('_', 1)[-1] <= cutoff
+        }
+
+    try:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(settled))
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def prefetch_price_frames(trades: List[Dict], windows: List[int],
+                          benchmark: str = 'SPY',
+                          price_cache: Dict = None,
+                          tx_dates: Optional[np.ndarray] = None,
+                          tickers: Optional[List[str]] = None,
+                          max_workers: int = PREFETCH_MAX_WORKERS) -> Dict[str, PriceFrame]:
+    """
+    Download closing prices for every traded ticker (plus benchmark) in bulk
+
+    Tickers are downloaded in chunks of PREFETCH_CHUNK_SIZE, concurrently.
+    Each chunk spans only its own tickers' earliest transaction through
+    latest exit window, so per-trade lookups can be answered from memory
+    instead of issuing one history request per (ticker, date).
+
+    Args:
+        trades: List of trade dicts with ticker and transaction_date
+        windows: Return windows that will be looked up
+        benchmark: Benchmark ticker to include
+        price_cache: Optional price cache; trades whose prices are all
+                     already cached are left out of the download
+        tx_dates: Optional pre-parsed dates (see parse_trade_dates)
+        tickers: Optional tickers aligned with trades (see trades_table)
+        max_workers: Chunks downloaded concurrently
+
+    Returns:
+        Dict mapping ticker -> (sorted datetime64 dates, closes) arrays.
+        Tickers that returned no data are omitted.
+    """
+    if tx_dates is None:
+        tx_dates = parse_trade_dates(trades)
+    if tickers is None:
+        tickers = [t.get('ticker') for t in trades]
+
+    today = np.datetime64(datetime.now().date(), 'D')
+    spans = {}  # ticker -> [earliest, latest] transaction date still needing prices
+
+    def need(ticker, tx_date):
+        span = spans.get(ticker)
+        if span is None:
+            spans[ticker] = [tx_date, tx_date]
+        else:
+            span[0] = min(span[0], tx_date)
+            span[1] = max(span[1], tx_date)
+
+    for ticker, tx_date in zip(tickers, tx_dates):
+        if np.isnat(tx_date) or not isinstance(ticker, str):
+            continue
+
+        if price_cache is None or any(
+                k not in price_cache for k in _needed_price_keys(ticker, tx_date, windows, today)):
+            need(ticker, tx_date)
+        if price_cache is None or any(
+                k not in price_cache for k in _needed_price_keys(benchmark, tx_date, windows, today)):
+            need(benchmark, tx_date)
+
+    if not spans:
+        return {}
+
+    # Neighbouring spans share a chunk, keeping each chunk's date range tight
+    ordered = sorted(spans, key=lambda t: (spans[t][0], t))
+    chunks = [ordered[i:i + PREFETCH_CHUNK_SIZE]
+              for i in range(0, len(ordered), PREFETCH_CHUNK_SIZE)]
+
+    slack = timedelta(days=PRICE_LOOKUP_SLACK_DAYS)
+    horizon = timedelta(days=max(windows, default=0))
+    latest_end = datetime.now() + timedelta(days=1)
+
+    def download(chunk):
+        start = pd.Timestamp(min(spans[t][0] for t in chunk)).to_pydatetime() - slack
+        end = min(pd.Timestamp(max(spans[t][1] for t in chunk)).to_pydatetime() + horizon + slack,
+                  latest_end)
+        try:
+            data = yf.download(chunk, start=start, end=end, group_by='ticker',
+                               threads=False, progress=False)
+        except Exception:
+            return {}
+        if data is None or data.empty:
+            return {}
+
+        chunk_frames = {}
+        for ticker in chunk:
+            try:
+                if isinstance(data.columns, pd.MultiIndex):
+                    if ticker not in data.columns.get_level_values(0):
+                        continue
+                    closes = data[ticker]['Close']
+                else:
+                    closes = data['Close']
+            except KeyError:
+                continue
+
+            frame = _to_frame(closes)
+            if frame is not None:
+                chunk_frames[ticker] = frame
+        return chunk_frames
+
+    frames = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as ex:
+        for chunk_frames in ex.map(download, chunks):
+            frames.update(chunk_frames)
+
+    return frames
+
+
+def _to_frame(closes: pd.Series) -> Optional[PriceFrame]:
+    """Convert a Close series to a sorted, tz-naive PriceFrame (None if empty)"""
+    closes = closes.dropna()
+    if closes.empty:
+        return None
+    closes.index = pd.to_datetime(closes.index).tz_localize(None)
+    closes = closes.sort_index()
+    return closes.index.values, closes.to_numpy(dtype=float)
+
+
+def _fetch_frame(ticker: str, start: datetime, end: datetime) -> Optional[PriceFrame]:
+    """One history request for ticker covering [start, end)"""
+    try:
+        hist = _ticker(ticker).history(start=start, end=end)
+    except Exception:
+        return None
+    if hist.empty or 'Close' not in hist.columns:
+        return None
+    return _to_frame(hist['Close'])
+
+
+def _lookup_price(frame: PriceFrame, target_date: datetime) -> Optional[float]:
+    """
+    Find the close on or before target_date in a prefetched frame
+
+    Mirrors the network lookup: the last trading day within the slack window
+    before the target, else the first one after it. Pure binary search on
+    the frame's arrays - no pandas indexing.
+    """
+    dates, closes = frame
+    target = np.array([np.datetime64(target_date.replace(tzinfo=None), 'D')])
+    price = _lookup_prices(dates, closes, target)[0]
+    return None if np.isnan(price) else float(price)
+
+
+def _ticker(symbol: str) -> yf.Ticker:
+    """Return a shared yf.Ticker for symbol"""
+    with _tickers_lock:
+        stock = _tickers.get(symbol)
+        if stock is None:
+            stock = _tickers[symbol] = yf.Ticker(symbol)
+        return stock
+
 
 def get_price_on_date(ticker: str, target_date: datetime,
-                      price_cache: Dict = None) -> Optional[float]:
+                      price_cache: Dict = None,
+                      price_frames: Dict[str, PriceFrame] = None) -> Optional[float]:
     """
     Get closing price for a ticker on or near a specific date
 
@@ -35,22 +304,32 @@ def get_price_on_date(ticker: str, target_date: datetime,
         ticker: Stock symbol
         target_date: Date to get price for
         price_cache: Optional cache dict to avoid repeated API calls
+        price_frames: Optional prefetched closes (see prefetch_price_frames);
+                      used instead of a network request when it covers ticker
 
     Returns:
         Closing price or None if unavailable
     """
     cache_key = f"{ticker}_{target_date.strftime('%Y-%m-%d')}"
 
-    if price_cache is not None and cache_key in price_cache:
-        return price_cache[cache_key]
+    if price_cache is not None:
+        with _price_cache_lock:
+            if cache_key in price_cache:
+                return price_cache[cache_key]
+
+    if price_frames is not None and ticker in price_frames:
+        price = _lookup_price(price_frames[ticker], target_date)
+        if price is not None and price_cache is not None:
+            with _price_cache_lock:
+                price_cache[cache_key] = price
+        return price
 
     try:
         # Get a window around target date (in case of weekends/holidays)
-        start = target_date - timedelta(days=5)
-        end = target_date + timedelta(days=5)
+        start = target_date - timedelta(days=PRICE_LOOKUP_SLACK_DAYS)
+        end = target_date + timedelta(days=PRICE_LOOKUP_SLACK_DAYS)
 
-        stock = yf.Ticker(ticker)
-        hist = stock.history(start=start, end=end)
+        hist = _ticker(ticker).history(start=start, end=end)
 
         if hist.empty:
             return None
@@ -69,7 +348,8 @@ def get_price_on_date(ticker: str, target_date: datetime,
         price = hist.loc[closest_date, 'Close']
 
         if price_cache is not None:
-            price_cache[cache_key] = price
+            with _price_cache_lock:
+                price_cache[cache_key] = price
 
         return float(price)
 
@@ -78,7 +358,8 @@ def get_price_on_date(ticker: str, target_date: datetime,
 
 
 def calculate_trade_returns(trade: Dict, windows: List[int] = [30, 60, 90],
-                           price_cache: Dict = None) -> Dict:
+                           price_cache: Dict = None,
+                           price_frames: Dict[str, PriceFrame] = None) -> Dict:
     """
     Calculate returns for a single congressional trade at various windows
 
@@ -86,6 +367,7 @@ def calculate_trade_returns(trade: Dict, windows: List[int] = [30, 60, 90],
         trade: Trade dict with ticker, transaction_date, transaction_type
         windows: List of days to calculate returns (default: 30, 60, 90)
         price_cache: Optional price cache
+        price_frames: Optional prefetched closes
 
     Returns:
         Dict with returns for each window
@@ -94,8 +376,20 @@ def calculate_trade_returns(trade: Dict, windows: List[int] = [30, 60, 90],
     tx_date = datetime.strptime(trade['transaction_date'], '%Y-%m-%d')
     tx_type = trade['transaction_type'].lower()
 
+    # Too recent for even the shortest window: skip before any price request
+    if windows and tx_date + timedelta(days=min(windows)) > datetime.now():
+        return {
+            'ticker': ticker,
+            'politician': trade.get('politician', 'Unknown'),
+            'transaction_date': trade['transaction_date'],
+            'transaction_type': tx_type,
+            'entry_price': None,
+            'returns': {f'{days}d': None for days in windows},
+            'skipped': 'future'
+        }
+
     # Get entry price
-    entry_price = get_price_on_date(ticker, tx_date, price_cache)
+    entry_price = get_price_on_date(ticker, tx_date, price_cache, price_frames)
     if entry_price is None:
         return {'error': f'No price data for {ticker} on {tx_date}'}
 
@@ -117,7 +411,7 @@ def calculate_trade_returns(trade: Dict, windows: List[int] = [30, 60, 90],
             results['returns'][f'{days}d'] = None
             continue
 
-        exit_price = get_price_on_date(ticker, exit_date, price_cache)
+        exit_price = get_price_on_date(ticker, exit_date, price_cache, price_frames)
         if exit_price is None:
             results['returns'][f'{days}d'] = None
             continue
@@ -135,7 +429,8 @@ def calculate_trade_returns(trade: Dict, windows: List[int] = [30, 60, 90],
 
 
 def get_benchmark_returns(start_date: datetime, windows: List[int] = [30, 60, 90],
-                         benchmark: str = 'SPY') -> Dict:
+                         benchmark: str = 'SPY', price_cache: Dict = None,
+                         price_frames: Dict[str, PriceFrame] = None) -> Dict:
     """
     Get benchmark (SPY) returns for comparison
 
@@ -143,13 +438,16 @@ def get_benchmark_returns(start_date: datetime, windows: List[int] = [30, 60, 90
         start_date: Starting date
         windows: List of days to calculate returns
         benchmark: Benchmark ticker (default: SPY for S&P 500)
+        price_cache: Optional price cache (shared with trade lookups)
+        price_frames: Optional prefetched closes
 
     Returns:
         Dict with benchmark returns for each window
     """
-    price_cache = {}
+    if price_cache is None:
+        price_cache = {}
 
-    entry_price = get_price_on_date(benchmark, start_date, price_cache)
+    entry_price = get_price_on_date(benchmark, start_date, price_cache, price_frames)
     if entry_price is None:
         return {'error': f'No benchmark data for {start_date}'}
 
@@ -162,7 +460,7 @@ def get_benchmark_returns(start_date: datetime, windows: List[int] = [30, 60, 90
             results['returns'][f'{days}d'] = None
             continue
 
-        exit_price = get_price_on_date(benchmark, exit_date, price_cache)
+        exit_price = get_price_on_date(benchmark, exit_date, price_cache, price_frames)
         if exit_price is None:
             results['returns'][f'{days}d'] = None
             continue
@@ -173,9 +471,163 @@ def get_benchmark_returns(start_date: datetime, windows: List[int] = [30, 60, 90
     return results
 
 
+def _lookup_prices(dates: np.ndarray, closes: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """
+    Vectorized _lookup_price over an array of target dates
+
+    Args:
+        dates: Sorted datetime64 trading dates
+        closes: Close prices aligned with dates
+        targets: datetime64 target dates (any shape)
+
+    Returns:
+        Prices with the same shape as targets (NaN where unavailable)
+    """
+    targets = targets.astype(dates.dtype)
+    slack = np.timedelta64(PRICE_LOOKUP_SLACK_DAYS, 'D')
+    last = len(dates) - 1
+
+    before = np.searchsorted(dates, targets, side='right') - 1
+    after = before + 1
+    before_c = np.clip(before, 0, last)
+    after_c = np.clip(after, 0, last)
+
+    use_before = (before >= 0) & (dates[before_c] >= targets - slack)
+    use_after = ~use_before & (after <= last) & (dates[after_c] < targets + slack)
+
+    return np.where(use_before, closes[before_c],
+                    np.where(use_after, closes[after_c], np.nan))
+
+
+def _progress(iterable, total: int, verbose: bool):
+    """
+    Wrap an iterator with a tqdm bar when available and verbose; otherwise
+    print a single line every 10% when verbose
+    """
+    if not verbose:
+        return iterable
+    if HAS_TQDM:
+        return tqdm(iterable, total=total, desc="  Fetching", unit="ticker", leave=False)
+
+    def batched():
+        step = max(1, total // 10)
+        for i, item in enumerate(iterable, 1):
+            yield item
+            if i % step == 0 or i == total:
+                print(f"  Fetched {i}/{total}")
+    return batched()
+
+
+def _store_prices(price_cache: Dict, ticker: str, dates: np.ndarray, resolved: np.ndarray):
+    """Record ticker's resolved prices (NaN = unresolved) in price_cache"""
+    with _price_cache_lock:
+        for date, price in zip(dates, resolved):
+            if not np.isnan(price):
+                price_cache[f"{ticker}_{date}"] = float(price)
+
+
+def _price_matrix(tickers: List[str], tx_dates: np.ndarray, windows: List[int],
+                  price_cache: Dict, price_frames: Dict[str, PriceFrame],
+                  max_workers: int = DEFAULT_MAX_WORKERS,
+                  verbose: bool = False) -> np.ndarray:
+    """
+    Entry and exit closes for every trade as an [N, 1 + W] matrix
+
+    Column 0 is the transaction date, column k the date windows[k-1] days
+    later. Exit dates in the future and unavailable prices are NaN.
+
+    Each distinct (ticker, date) is resolved once however many trades share
+    it, then scattered back to every cell that needs it. Dates are answered
+    from price_cache first, then from the ticker's price_frames entry with
+    one vectorized lookup. Any remaining dates cost one history request per
+    ticker (spanning all of its missing dates) on a thread pool rather than
+    one request per cell.
+    """
+    offsets = np.array([0] + list(windows), dtype='timedelta64[D]')
+    targets = tx_dates[:, None] + offsets
+    today = np.datetime64(datetime.now().date(), 'D')
+    wanted = targets <= today
+
+    # Group rows by ticker without a per-ticker scan of the whole list
+    codes, names = pd.factorize(np.asarray(tickers, dtype=object))
+    order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[order], np.arange(len(names) + 1))
+
+    groups = {}  # ticker -> (rows, unique wanted dates, inverse map, resolved prices)
+    spans = {}
+    slack = np.timedelta64(PRICE_LOOKUP_SLACK_DAYS, 'D')
+
+    for i, ticker in enumerate(names):
+        rows = order[bounds[i]:bounds[i + 1]]
+        dates, inverse = np.unique(targets[rows][wanted[rows]], return_inverse=True)
+        resolved = np.full(len(dates), np.nan)
+        groups[ticker] = (rows, dates, inverse, resolved)
+
+        # Cached prices first: the prefetch leaves fully cached trades out of
+        # its download, so the frame need not cover their dates
+        with _price_cache_lock:
+            for d, date in enumerate(dates):
+                price = price_cache.get(f"{ticker}_{date}")
+                if price is not None:
+                    resolved[d] = price
+
+        frame = price_frames.get(ticker)
+        if frame is not None:
+            unresolved = np.isnan(resolved)
+            if unresolved.any():
+                resolved[unresolved] = _lookup_prices(frame[0], frame[1], dates[unresolved])
+                _store_prices(price_cache, ticker, dates, resolved)
+
+        # Whatever is still missing costs one span request per ticker
+        missing = dates[np.isnan(resolved)]
+        if len(missing):
+            spans[ticker] = (pd.Timestamp(missing.min() - slack).to_pydatetime(),
+                             pd.Timestamp(missing.max() + slack).to_pydatetime())
+
+    if spans:
+        if verbose:
+            print(f"  Fetching history for {len(spans)} tickers with prices the prefetch missed...")
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(spans)))) as ex:
+            futures = {ex.submit(_fetch_frame, ticker, start, end): ticker
+                       for ticker, (start, end) in spans.items()}
+            # Progress is reported from this thread only, never from the workers
+            for future in _progress(as_completed(futures), len(futures), verbose):
+                ticker = futures[future]
+                frame = future.result()
+                if frame is None:
+                    continue
+                _, dates, _, resolved = groups[ticker]
+                unresolved = np.isnan(resolved)
+                resolved[unresolved] = _lookup_prices(frame[0], frame[1], dates[unresolved])
+                _store_prices(price_cache, ticker, dates, resolved)
+
+    prices = np.full(targets.shape, np.nan)
+    for rows, dates, inverse, resolved in groups.values():
+        block = np.full((len(rows), targets.shape[1]), np.nan)
+        block[wanted[rows]] = resolved[inverse.ravel()]
+        prices[rows] = block
+    return prices
+
+
+def _window_returns(prices: np.ndarray, is_sell: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Percent returns from entry (column 0) to each exit column, rounded to 0.01
+
+    Sells are inverted (as if shorting what Congress sells).
+    """
+    entry = prices[:, :1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = (prices[:, 1:] - entry) / entry * 100.0
+    if is_sell is not None:
+        returns[is_sell] *= -1
+    return np.round(returns, 2)
+
+
 def backtest_congressional_trades(trades: List[Dict],
                                   windows: List[int] = [30, 60, 90],
-                                  verbose: bool = True) -> Dict:
+                                  verbose: bool = True,
+                                  max_workers: int = DEFAULT_MAX_WORKERS,
+                                  benchmark: str = 'SPY') -> Dict:
     """
     Backtest a list of congressional trades
 
@@ -183,211 +635,386 @@ def backtest_congressional_trades(trades: List[Dict],
         trades: List of trade dicts from congressional_trades module
         windows: Return windows to calculate
         verbose: Print progress
+        max_workers: Concurrent history requests for tickers the prefetch missed
+        benchmark: Benchmark ticker (default: SPY)
 
     Returns:
         Comprehensive backtest results
     """
     if verbose:
-        print(f"Backtesting {len(trades)} congressional trades...")
-        print(f"Windows: {windows} days")
-        print("-" * 60)
+        print(f"Backtesting {len(trades)} congressional trades...\n"
+              f"Windows: {windows} days\n" + "-" * 60)
+
+    # Columnar view of the trades; rows without a ticker or valid date can't be priced
+    table = trades_table(trades)
+    table = table[table['ticker'].notna() & table['tx_date'].notna()]
+
+    # Trades too recent for the shortest window have nothing to measure yet;
+    # dropping them also keeps them out of the prefetch date span
+    if windows:
+        today = np.datetime64(datetime.now().date(), 'D')
+        matured = table['tx_date'].to_numpy(dtype='datetime64[D]') + np.timedelta64(min(windows), 'D') <= today
+        if verbose and not matured.all():
+            print(f"Skipping {int((~matured).sum())} trades newer than {min(windows)} days")
+        table = table[matured]
+
+    tickers = table['ticker'].astype(str).tolist()
+    tx_dates = table['tx_date'].to_numpy(dtype='datetime64[D]')
+    is_sell = table['is_sell'].to_numpy(dtype=bool)
+
+    # Settled prices from earlier runs, then one bulk download for the rest
+    price_cache = load_price_cache()
+    # Tickers and dates come from the table, so no trade dicts are needed
+    price_frames = prefetch_price_frames([], windows,
+                                         benchmark=benchmark, price_cache=price_cache,
+                                         tx_dates=tx_dates, tickers=tickers)
+    if verbose:
+        print(f"Prefetched price history for {len(price_frames)} tickers "
+              f"({len(price_cache)} cached prices)")
+
+    prices = _price_matrix(tickers, tx_dates, windows, price_cache, price_frames,
+                           max_workers=max_workers, verbose=verbose)
+    has_entry = ~np.isnan(prices[:, 0])
+
+    # Benchmark prices only for trades that could be priced
+    bench_prices = _price_matrix([benchmark] * int(has_entry.sum()), tx_dates[has_entry],
+                                 windows, price_cache, price_frames,
+                                 max_workers=max_workers)
+
+    save_price_cache(price_cache)
+
+    trade_returns = _window_returns(prices[has_entry], is_sell[has_entry])
+    bench_returns = _window_returns(bench_prices)
+    keys = [f'{window}d' for window in windows]
+
+    priced = table[has_entry]
+    results = [
+        {
+            'ticker': ticker,
+            'politician': politician,
+            'transaction_date': tx_date,
+            'transaction_type': tx_type,
+            'entry_price': float(entry),
+            'returns': {
+                key: None if np.isnan(value) else float(value)
+                for key, value in zip(keys, row)
+            }
+        }
+        for ticker, politician, tx_date, tx_type, entry, row in zip(
+            priced['ticker'].astype(str), priced['politician'], priced['transaction_date'],
+            priced['transaction_type'], prices[has_entry, 0], trade_returns)
+    ]
 
-    price_cache = {}
-    results = []
-    benchmark_returns = defaultdict(list)
+    # NaN marks missing/future benchmark prices; the statistics skip them
+    benchmark_returns = {key: bench_returns[:, w] for w, key in enumerate(keys)}
 
-    for i, trade in enumerate(trades):
-        if verbose and (i + 1) % 10 == 0:
-            print(f"  Processing trade {i + 1}/{len(trades)}...")
+    # Calculate aggregate statistics straight from the return matrix
+    stats = calculate_backtest_statistics(results, benchmark_returns, windows,
+                                          returns_matrix=trade_returns)
 
-        # Calculate trade returns
-        trade_result = calculate_trade_returns(trade, windows, price_cache)
+    return {
+        'individual_trades': results,
+        'statistics': stats,
+        'windows': windows,
+        'total_trades_analyzed': len(results),
+        'total_trades_input': len(trades)
+    }
 
-        if 'error' in trade_result:
-            continue
 
-        results.append(trade_result)
+def _buy_sell_masks(tx_types: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Boolean buy/sell masks from lowercased transaction types"""
+    is_buy = np.array([('buy' in tx or 'purchase' in tx) for tx in tx_types], dtype=bool)
+    is_sell = np.array([('sell' in tx or 'sale' in tx) for tx in tx_types], dtype=bool)
+    return is_buy, is_sell
+
+
+def _masked_nanmean(matrix: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Per-column mean over rows where mask is set, ignoring NaN (NaN if none)"""
+    selected = matrix[mask]
+    counts = np.sum(~np.isnan(selected), axis=0)
+    sums = np.nansum(selected, axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+
 
-        # Get benchmark for same period
-        tx_date = datetime.strptime(trade['transaction_date'], '%Y-%m-%d')
-        bench = get_benchmark_returns(tx_date, windows)
+def _window_stats(returns: np.ndarray, is_buy: np.ndarray,
+                  is_sell: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """
+    Per-window count, win rate, mean, std, buy mean and sell mean
+
+    NaN cells are ignored. Columns without data get a count of 0 (their
+    other values are meaningless). Each statistic is one axis-0 reduction.
+    """
+    valid = ~np.isnan(returns)
+    counts = valid.sum(axis=0)
+    # Columns with no data are filled so the reductions below stay warning-free
+    safe = np.where(counts > 0, returns, 0.0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        win_rate = (returns > 0).sum(axis=0) / np.maximum(counts, 1) * 100
+        avg_return = np.nanmean(safe, axis=0)
+        std_return = np.nanstd(safe, axis=0)
+
+    return (counts, win_rate, avg_return, std_return,
+            _masked_nanmean(returns, is_buy), _masked_nanmean(returns, is_sell))
+
+
+if HAS_NUMBA:
+    @njit(parallel=True, cache=True)
+    def _fused_window_stats(returns, is_buy, is_sell):
+        """
+        Same results as _window_stats, with all reductions for a window fused
+        into one pass over its column (plus one for the variance), windows
+        in parallel
+        """
+        n, w = returns.shape
+        counts = np.zeros(w, dtype=np.int64)
+        win_rate = np.full(w, np.nan)
+        avg_return = np.full(w, np.nan)
+        std_return = np.full(w, np.nan)
+        buy_avg = np.full(w, np.nan)
+        sell_avg = np.full(w, np.nan)
+
+        for j in prange(w):
+            count = 0
+            wins = 0
+            total = 0.0
+            buy_total = 0.0
+            buy_count = 0
+            sell_total = 0.0
+            sell_count = 0
+            for i in range(n):
+                value = returns[i, j]
+                if np.isnan(value):
+                    continue
+                count += 1
+                total += value
+                if value > 0:
+                    wins += 1
+                if is_buy[i]:
+                    buy_total += value
+                    buy_count += 1
+                if is_sell[i]:
+                    sell_total += value
+                    sell_count += 1
+
+            counts[j] = count
+            if buy_count > 0:
+                buy_avg[j] = buy_total / buy_count
+            if sell_count > 0:
+                sell_avg[j] = sell_total / sell_count
+            if count == 0:
+                continue
+
+            mean = total / count
+            squares = 0.0
+            for i in range(n):
+                value = returns[i, j]
+                if not np.isnan(value):
+                    squares += (value - mean) ** 2
+
+            win_rate[j] = wins / count * 100
+            avg_return[j] = mean
+            std_return[j] = np.sqrt(squares / count)
+
+        return counts, win_rate, avg_return, std_return, buy_avg, sell_avg
+
+
+def _extreme_rows(ranked: np.ndarray, k: int) -> np.ndarray:
+    """
+    Row indices of the k largest values in each column, largest first
+
+    Args:
+        ranked: [N, W] matrix (use -inf for rows that should rank last)
+        k: Rows to return per column (clipped to N)
 
-        if 'error' not in bench:
-            for window in windows:
-                key = f'{window}d'
-                if bench['returns'].get(key) is not None:
-                    benchmark_returns[key].append(bench['returns'][key])
+    Returns:
+        [min(k, N), W] index matrix
+    """
+    k = max(1, min(k, ranked.shape[0]))
+    picks = np.argpartition(-ranked, k - 1, axis=0)[:k]
+    order = np.argsort(-np.take_along_axis(ranked, picks, axis=0), axis=0, kind='stable')
+    return np.take_along_axis(picks, order, axis=0)
 
-    # Calculate aggregate statistics
-    stats = calculate_backtest_statistics(results, benchmark_returns, windows)
 
+def _trade_summary(result: Dict, key: str) -> Dict:
+    """Ticker, politician and window return of one backtested trade"""
     return {
-        'individual_trades': results,
-        'statistics': stats,
-        'windows': windows,
-        'total_trades_analyzed': len(results),
-        'total_trades_input': len(trades)
+        'ticker': result['ticker'],
+        'politician': result['politician'],
+        'return': result['returns'][key]
     }
 
 
 def calculate_backtest_statistics(results: List[Dict],
                                   benchmark_returns: Dict,
-                                  windows: List[int]) -> Dict:
+                                  windows: List[int],
+                                  returns_matrix: Optional[np.ndarray] = None,
+                                  top_k: int = 5) -> Dict:
     """
     Calculate aggregate statistics from backtest results
-    """
-    stats = {}
 
-    for window in windows:
-        key = f'{window}d'
-
-        # Extract returns for this window
-        trade_returns = [r['returns'].get(key) for r in results
-                        if r['returns'].get(key) is not None]
+    Returns are laid out once as an [N, W] matrix (NaN = no data) and every
+    statistic is reduced along axis 0, so all windows are computed together.
 
-        if not trade_returns:
+    Args:
+        results: Per-trade result dicts
+        benchmark_returns: Window key -> benchmark returns (list or array, NaN ignored)
+        windows: Return windows
+        returns_matrix: Optional [N, W] returns aligned with results; built
+            from the result dicts when omitted
+        top_k: Number of best/worst trades listed per window (at most half
+            of the window's trades, so the two lists never overlap)
+    """
+    stats = {}
+    keys = [f'{window}d' for window in windows]
+
+    if not results:
+        return {key: {'error': 'No valid returns data'} for key in keys}
+
+    if returns_matrix is not None:
+        returns = np.asarray(returns_matrix, dtype=float)
+    else:
+        returns = np.array([
+            [np.nan if r['returns'].get(key) is None else r['returns'][key] for key in keys]
+            for r in results
+        ], dtype=float).reshape(len(results), len(keys))
+    is_buy, is_sell = _buy_sell_masks([r['transaction_type'] for r in results])
+
+    valid = ~np.isnan(returns)
+    if HAS_NUMBA:
+        counts, win_rate, avg_return, std_return, buy_avg, sell_avg = _fused_window_stats(
+            np.ascontiguousarray(returns), is_buy, is_sell)
+    else:
+        counts, win_rate, avg_return, std_return, buy_avg, sell_avg = _window_stats(
+            returns, is_buy, is_sell)
+    has_data = counts > 0
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Columns with no data are filled so nanmedian stays warning-free
+        median_return = np.nanmedian(np.where(has_data, returns, 0.0), axis=0)
+
+    # Top/bottom K per window: argpartition is O(N), only the K picks get sorted
+    best_idx = _extreme_rows(np.where(valid, returns, -np.inf), top_k)
+    worst_idx = _extreme_rows(np.where(valid, -returns, -np.inf), top_k)
+
+    for w, key in enumerate(keys):
+        if not has_data[w]:
             stats[key] = {'error': 'No valid returns data'}
             continue
 
-        # Calculate statistics
-        returns_array = np.array(trade_returns)
-        bench_array = np.array(benchmark_returns.get(key, []))
-
-        win_rate = np.mean(returns_array > 0) * 100
-        avg_return = np.mean(returns_array)
-        median_return = np.median(returns_array)
-        std_return = np.std(returns_array)
-
-        # Best and worst trades
-        best_idx = np.argmax(returns_array)
-        worst_idx = np.argmin(returns_array)
-        best_trade = results[best_idx] if best_idx < len(results) else None
-        worst_trade = results[worst_idx] if worst_idx < len(results) else None
+        avg = float(avg_return[w])
+        std = float(std_return[w])
 
         # Sharpe ratio (assuming 0% risk-free rate for simplicity)
-        sharpe = avg_return / std_return if std_return > 0 else 0
+        sharpe = avg / std if std > 0 else 0
 
         # Alpha vs benchmark
-        bench_avg = np.mean(bench_array) if len(bench_array) > 0 else 0
-        alpha = avg_return - bench_avg
-
-        # Separate buys vs sells
-        buy_returns = [r['returns'][key] for r in results
-                      if r['returns'].get(key) is not None
-                      and ('buy' in r['transaction_type'] or 'purchase' in r['transaction_type'])]
-        sell_returns = [r['returns'][key] for r in results
-                       if r['returns'].get(key) is not None
-                       and ('sell' in r['transaction_type'] or 'sale' in r['transaction_type'])]
+        bench = np.asarray(benchmark_returns.get(key, []), dtype=float)
+        bench_avg = float(np.nanmean(bench)) if np.any(~np.isnan(bench)) else 0
+        alpha = avg - bench_avg
+
+        # At most half the window's trades per list, so with fewer than
+        # 2 * top_k trades the best and worst lists don't overlap
+        k = max(1, int(counts[w]) // 2)
+        top_rows = [r for r in best_idx[:, w] if valid[r, w]][:k]
+        bottom_rows = [r for r in worst_idx[:, w] if valid[r, w]][:k]
+        best_trade = results[top_rows[0]]
+        worst_trade = results[bottom_rows[0]]
 
         stats[key] = {
-            'trade_count': len(trade_returns),
-            'win_rate': round(win_rate, 1),
-            'avg_return': round(avg_return, 2),
-            'median_return': round(median_return, 2),
-            'std_dev': round(std_return, 2),
+            'trade_count': int(counts[w]),
+            'win_rate': round(float(win_rate[w]), 1),
+            'avg_return': round(avg, 2),
+            'median_return': round(float(median_return[w]), 2),
+            'std_dev': round(std, 2),
             'sharpe_ratio': round(sharpe, 3),
             'benchmark_avg': round(bench_avg, 2),
             'alpha_vs_spy': round(alpha, 2),
-            'best_return': round(float(np.max(returns_array)), 2),
-            'worst_return': round(float(np.min(returns_array)), 2),
-            'best_trade': {
-                'ticker': best_trade['ticker'],
-                'politician': best_trade['politician'],
-                'return': best_trade['returns'][key]
-            } if best_trade else None,
-            'worst_trade': {
-                'ticker': worst_trade['ticker'],
-                'politician': worst_trade['politician'],
-                'return': worst_trade['returns'][key]
-            } if worst_trade else None,
-            'buy_avg': round(np.mean(buy_returns), 2) if buy_returns else None,
-            'sell_avg': round(np.mean(sell_returns), 2) if sell_returns else None,
+            'best_return': round(float(returns[top_rows[0], w]), 2),
+            'worst_return': round(float(returns[bottom_rows[0], w]), 2),
+            'best_trade': _trade_summary(best_trade, key),
+            'worst_trade': _trade_summary(worst_trade, key),
+            'top_trades': [_trade_summary(results[r], key) for r in top_rows],
+            'bottom_trades': [_trade_summary(results[r], key) for r in bottom_rows],
+            'buy_avg': None if np.isnan(buy_avg[w]) else round(float(buy_avg[w]), 2),
+            'sell_avg': None if np.isnan(sell_avg[w]) else round(float(sell_avg[w]), 2),
         }
 
     return stats
 
 
-def format_backtest_report(backtest_results: Dict) -> str:
-    """
-    Format backtest results into human-readable report
-    """
-    stats = backtest_results['statistics']
-    windows = backtest_results['windows']
+def _fmt(val, fmt_str: str = "+.2f") -> str:
+    """Format a number for the report, N/A for missing values"""
+    if val is None:
+        return "N/A"
+    try:
+        return f"{val:{fmt_str}}"
+    except (TypeError, ValueError):
+        return str(val)
 
-    report = f"""
-CONGRESSIONAL TRADING BACKTEST REPORT
-=====================================
-Analysis Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}
-Trades Analyzed: {backtest_results['total_trades_analyzed']} / {backtest_results['total_trades_input']}
 
-CORE QUESTION: Does following Congress make money?
+def _trade_lines(trades: List[Dict]) -> str:
+    """One report line per trade summary"""
+    return "\n".join(
+        f"  {t.get('ticker', 'N/A')} ({t.get('politician', 'N/A')}): {_fmt(t.get('return'))}%"
+        for t in trades
+    )
 
-"""
 
-    for window in windows:
-        key = f'{window}d'
-        s = stats.get(key, {})
+def _verdict(alpha: float) -> str:
+    """Answer to the core question for one window's alpha"""
+    if alpha > 2:
+        return "YES - Significant alpha"
+    elif alpha > 0:
+        return "MAYBE - Slight outperformance"
+    elif alpha > -2:
+        return "NEUTRAL - Market-like returns"
+    return "NO - Underperforms market"
 
-        if 'error' in s:
-            report += f"\n{window}-Day Returns: {s['error']}\n"
-            continue
 
-        # Determine verdict
-        alpha = s.get('alpha_vs_spy', 0) or 0
-        if alpha > 2:
-            verdict = "YES - Significant alpha"
-        elif alpha > 0:
-            verdict = "MAYBE - Slight outperformance"
-        elif alpha > -2:
-            verdict = "NEUTRAL - Market-like returns"
-        else:
-            verdict = "NO - Underperforms market"
+_REPORT_HEADER = """
+CONGRESSIONAL TRADING BACKTEST REPORT
+=====================================
+Analysis Timestamp: {timestamp}
+Trades Analyzed: {analyzed} / {total}
 
-        # Safe formatting helper
-        def fmt(val, fmt_str="+.2f"):
-            if val is None:
-                return "N/A"
-            try:
-                return f"{val:{fmt_str}}"
-            except:
-                return str(val)
+CORE QUESTION: Does following Congress make money?
 
-        # Safely get nested values
-        best = s.get('best_trade') or {}
-        worst = s.get('worst_trade') or {}
+"""
 
-        report += f"""
-{'='*60}
+_REPORT_WINDOW = """
+{rule}
 {window}-DAY RETURNS
-{'='*60}
+{rule}
 
 VERDICT: {verdict}
 
 Performance Metrics:
-  Trades Analyzed:    {s.get('trade_count', 0)}
-  Win Rate:           {fmt(s.get('win_rate'), '.1f')}%
-  Average Return:     {fmt(s.get('avg_return'))}%
-  Median Return:      {fmt(s.get('median_return'))}%
-  Standard Deviation: {fmt(s.get('std_dev'), '.2f')}%
-  Sharpe Ratio:       {fmt(s.get('sharpe_ratio'), '.3f')}
+  Trades Analyzed:    {trade_count}
+  Win Rate:           {win_rate}%
+  Average Return:     {avg_return}%
+  Median Return:      {median_return}%
+  Standard Deviation: {std_dev}%
+  Sharpe Ratio:       {sharpe_ratio}
 
 Benchmark Comparison (SPY):
-  SPY Average:        {fmt(s.get('benchmark_avg'))}%
-  Alpha vs SPY:       {fmt(s.get('alpha_vs_spy'))}%
+  SPY Average:        {benchmark_avg}%
+  Alpha vs SPY:       {alpha_vs_spy}%
 
 Buy vs Sell Signals:
-  Buy Signal Avg:     {fmt(s.get('buy_avg'))}% (following purchases)
-  Sell Signal Avg:    {fmt(s.get('sell_avg'))}% (inversing sales)
+  Buy Signal Avg:     {buy_avg}% (following purchases)
+  Sell Signal Avg:    {sell_avg}% (inversing sales)
 
-Best Trade:
-  {best.get('ticker', 'N/A')} ({best.get('politician', 'N/A')}): {fmt(best.get('return'))}%
+Best Trades:
+{best_trades}
 
-Worst Trade:
-  {worst.get('ticker', 'N/A')} ({worst.get('politician', 'N/A')}): {fmt(worst.get('return'))}%
+Worst Trades:
+{worst_trades}
 
 """
 
-    report += """
+_REPORT_FOOTER = """
 =====================================
 METHODOLOGY NOTES
 =====================================
@@ -406,7 +1033,47 @@ guarantee future results. Congressional trading patterns may change.
 Always consult a licensed financial advisor before investing.
 """
 
-    return report
+
+def format_backtest_report(backtest_results: Dict) -> str:
+    """
+    Format backtest results into human-readable report
+    """
+    stats = backtest_results['statistics']
+    windows = backtest_results['windows']
+
+    parts = [_REPORT_HEADER.format(
+        timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC'),
+        analyzed=backtest_results['total_trades_analyzed'],
+        total=backtest_results['total_trades_input'],
+    )]
+
+    for window in windows:
+        s = stats.get(f'{window}d', {})
+
+        if 'error' in s:
+            parts.append(f"\n{window}-Day Returns: {s['error']}\n")
+            continue
+
+        parts.append(_REPORT_WINDOW.format_map({
+            'rule': '=' * 60,
+            'window': window,
+            'verdict': _verdict(s.get('alpha_vs_spy', 0) or 0),
+            'trade_count': s.get('trade_count', 0),
+            'win_rate': _fmt(s.get('win_rate'), '.1f'),
+            'avg_return': _fmt(s.get('avg_return')),
+            'median_return': _fmt(s.get('median_return')),
+            'std_dev': _fmt(s.get('std_dev'), '.2f'),
+            'sharpe_ratio': _fmt(s.get('sharpe_ratio'), '.3f'),
+            'benchmark_avg': _fmt(s.get('benchmark_avg')),
+            'alpha_vs_spy': _fmt(s.get('alpha_vs_spy')),
+            'buy_avg': _fmt(s.get('buy_avg')),
+            'sell_avg': _fmt(s.get('sell_avg')),
+            'best_trades': _trade_lines(s.get('top_trades') or [s.get('best_trade') or {}]),
+            'worst_trades': _trade_lines(s.get('bottom_trades') or [s.get('worst_trade') or {}]),
+        }))
+
+    parts.append(_REPORT_FOOTER)
+    return "".join(parts)
 
 
 def run_backtest_from_api(api_key: Optional[str] = None,
@@ -27,11 +27,45 @@ import os
 import sys
 from typing import List, Dict
 
+__version__ = "1.0.0"
+
 # Ensure project root is in path
 PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, PROJECT_ROOT)
 
 
+def _precompile_in_background():
+    """
+    Byte-compile the project's modules once, in a detached process
+
+    A fresh checkout has no .pyc files, so the first run of each command
+    parses and compiles every module it imports. When __pycache__ is
+    missing, compileall runs in the background (without blocking this
+    invocation) so later runs load bytecode directly. Skipped when bytecode
+    writing is disabled (-B / PYTHONDONTWRITEBYTECODE).
+    """
+    if sys.dont_write_bytecode or os.path.isdir(os.path.join(PROJECT_ROOT, '__pycache__')):
+        return
+
+    import subprocess
+    try:
+        # -l: top-level modules only; the CLI never imports from subdirectories
+        subprocess.Popen([sys.executable, '-m', 'compileall', '-q', '-l', PROJECT_ROOT],
+                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except OSError:
+        pass
+
+
+# Tool parameter specs shared by the analyze command's registrations
+_TICKER_PARAM = (("ticker", "Stock ticker symbol"),)
+_TICKER_EXAMPLE_PARAM = (("ticker", "Stock ticker symbol (e.g., 'AAPL')"),)
+_TICKER_PERIOD_PARAM = (("ticker", "Stock ticker symbol"), ("period", "Days of history (default: 90)"))
+
+# Every command imports its modules inside the function (after its API-key
+# check), so a subcommand never pays for anthropic/yfinance/pandas unless it
+# actually uses them.
+
+
 def cmd_analyze(ticker: str, collaborative: bool = False):
     """Run full ReAct analysis on a ticker"""
     api_key = os.environ.get("ANTHROPIC_API_KEY")
@@ -41,7 +75,7 @@ def cmd_analyze(ticker: str, collaborative: bool = False):
         return
 
     # Import and setup agent
-    from autoinvestor_react import ReActAgent, Tool, ToolRegistry
+    from autoinvestor_react import Tool
     from autoinvestor_react import get_stock_price, get_company_financials
     from autoinvestor_react import get_analyst_ratings, calculate_valuation, risk_assessment
     from technical_indicators import analyze_technicals
@@ -51,52 +85,53 @@ def cmd_analyze(ticker: str, collaborative: bool = False):
         from collaborative_agent import CollaborativeAgent
         agent = CollaborativeAgent(api_key=api_key, max_iterations=10)
     else:
+        from autoinvestor_react import ReActAgent
         agent = ReActAgent(api_key=api_key, max_iterations=10)
 
     # Register Phase 1 tools
     agent.tools.register(Tool(
         name="get_stock_price",
         description="Get current stock price, volume, and 52-week range",
-        func=get_stock_price,
-        parameters={"ticker": "Stock ticker symbol (e.g., 'AAPL')"}
+        function=get_stock_price,
+        parameters=_TICKER_EXAMPLE_PARAM
     ))
     agent.tools.register(Tool(
         name="get_company_financials",
         description="Get company financial metrics (revenue, earnings, margins)",
-        func=get_company_financials,
-        parameters={"ticker": "Stock ticker symbol"}
+        function=get_company_financials,
+        parameters=_TICKER_PARAM
     ))
     agent.tools.register(Tool(
         name="get_analyst_ratings",
         description="Get analyst consensus ratings and price targets",
-        func=get_analyst_ratings,
-        parameters={"ticker": "Stock ticker symbol"}
+        function=get_analyst_ratings,
+        parameters=_TICKER_PARAM
     ))
     agent.tools.register(Tool(
         name="calculate_valuation",
         description="Calculate valuation metrics (P/E, PEG, P/B, EV/EBITDA)",
-        func=calculate_valuation,
-        parameters={"ticker": "Stock ticker symbol"}
+        function=calculate_valuation,
+        parameters=_TICKER_PARAM
     ))
     agent.tools.register(Tool(
         name="risk_assessment",
         description="Assess investment risk (beta, volatility, debt ratios)",
-        func=risk_assessment,
-        parameters={"ticker": "Stock ticker symbol"}
+        function=risk_assessment,
+        parameters=_TICKER_PARAM
     ))
 
     # Register Phase 2 tools
     agent.tools.register(Tool(
         name="analyze_technicals",
         description="Technical analysis with SMA, RSI, MACD, Bollinger Bands",
-        func=analyze_technicals,
-        parameters={"ticker": "Stock ticker symbol", "period": "Days of history (default: 90)"}
+        function=analyze_technicals,
+        parameters=_TICKER_PERIOD_PARAM
     ))
     agent.tools.register(Tool(
         name="analyze_news_sentiment",
         description="Analyze recent news sentiment for a stock",
-        func=analyze_news_sentiment,
-        parameters={"ticker": "Stock ticker symbol"}
+        function=analyze_news_sentiment,
+        parameters=_TICKER_PARAM
     ))
 
     # Run analysis
@@ -215,8 +250,6 @@ def cmd_sec(ticker: str, query: str = None):
 
 def cmd_backtest(windows_str: str = "30,60,90"):
     """Backtest congressional trading strategy"""
-    from backtesting import run_backtest_from_api, format_backtest_report
-
     api_key = os.environ.get("RAPIDAPI_KEY")
     if not api_key:
         print("ERROR: RAPIDAPI_KEY environment variable required")
@@ -230,6 +263,8 @@ def cmd_backtest(windows_str: str = "30,60,90"):
         print("ERROR: Windows must be comma-separated integers (e.g., 30,60,90)")
         return
 
+    from backtesting import run_backtest_from_api, format_backtest_report
+
     print(f"\nRunning congressional trading backtest...")
     print(f"Return windows: {windows} days\n")
 
@@ -242,69 +277,121 @@ def cmd_backtest(windows_str: str = "30,60,90"):
         print(report)
 
 
-def main():
-    parser = argparse.ArgumentParser(
-        description="AutoInvestor CLI - AI-powered investment research",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-  python cli.py analyze NVDA                    Full analysis of NVIDIA
-  python cli.py analyze MSFT --collaborative    Interactive analysis with questions
-  python cli.py technicals AAPL                 Technical indicators for Apple
-  python cli.py congress --aggregate            Overall congressional trading trends
-  python cli.py congress AVGO                   Congressional trades for Broadcom
-  python cli.py portfolio AAPL MSFT GOOGL       Portfolio correlation analysis
-  python cli.py sectors AAPL:100 JPM:50         Sector allocation analysis
-  python cli.py backtest                        Backtest congressional trading strategy
-  python cli.py sec NVDA                        SEC filings analysis (10-K, 10-Q)
-  python cli.py sec AAPL -q "risk factors"      Search SEC filings with query
-
-Environment Variables:
-  ANTHROPIC_API_KEY   Required for 'analyze' command
-  RAPIDAPI_KEY        Required for 'congress' and 'backtest' commands
-        """
-    )
-
-    subparsers = parser.add_subparsers(dest='command', help='Available commands')
-
-    # analyze command
+def _add_analyze_parser(subparsers):
     analyze_parser = subparsers.add_parser('analyze', help='Full ReAct analysis of a stock')
     analyze_parser.add_argument('ticker', help='Stock ticker symbol')
     analyze_parser.add_argument('--collaborative', '-c', action='store_true',
                                help='Enable collaborative mode (AI asks questions)')
 
-    # technicals command
+
+def _add_technicals_parser(subparsers):
     tech_parser = subparsers.add_parser('technicals', help='Technical analysis (SMA, RSI, MACD, Bollinger)')
     tech_parser.add_argument('ticker', help='Stock ticker symbol')
     tech_parser.add_argument('--period', '-p', type=int, default=90,
                             help='Days of price history (default: 90)')
 
-    # congress command
+
+def _add_congress_parser(subparsers):
     congress_parser = subparsers.add_parser('congress', help='Congressional trading activity')
     congress_parser.add_argument('ticker', nargs='?', help='Stock ticker (optional if using --aggregate)')
     congress_parser.add_argument('--aggregate', '-a', action='store_true',
                                 help='Show aggregate trends across all Congress')
 
-    # portfolio command
+
+def _add_portfolio_parser(subparsers):
     portfolio_parser = subparsers.add_parser('portfolio', help='Portfolio correlation analysis')
     portfolio_parser.add_argument('tickers', nargs='+', help='Stock tickers in portfolio')
 
-    # sectors command
+
+def _add_sectors_parser(subparsers):
     sectors_parser = subparsers.add_parser('sectors', help='Sector allocation analysis')
     sectors_parser.add_argument('holdings', nargs='+',
                                help='Holdings as TICKER:SHARES (e.g., AAPL:100)')
 
-    # backtest command
+
+def _add_backtest_parser(subparsers):
     backtest_parser = subparsers.add_parser('backtest', help='Backtest congressional trading strategy')
     backtest_parser.add_argument('--windows', '-w', type=str, default='30,60,90',
                                 help='Comma-separated return windows in days (default: 30,60,90)')
 
-    # sec command
+
+def _add_sec_parser(subparsers):
     sec_parser = subparsers.add_parser('sec', help='Analyze SEC filings (10-K, 10-Q, 8-K)')
     sec_parser.add_argument('ticker', help='Stock ticker symbol')
     sec_parser.add_argument('--query', '-q', type=str, default=None,
                            help='Natural language query to search filings')
 
+
+# Subcommand name -> function registering its parser (insertion order = help order)
+_SUBCOMMAND_PARSERS = {
+    'analyze': _add_analyze_parser,
+    'technicals': _add_technicals_parser,
+    'congress': _add_congress_parser,
+    'portfolio': _add_portfolio_parser,
+    'sectors': _add_sectors_parser,
+    'backtest': _add_backtest_parser,
+    'sec': _add_sec_parser,
+}
+
+
+# Examples shown after the top-level --help output
+_EPILOG_TEXT = """
+Examples:
+  python cli.py analyze NVDA                    Full analysis of NVIDIA
+  python cli.py analyze MSFT --collaborative    Interactive analysis with questions
+  python cli.py technicals AAPL                 Technical indicators for Apple
+  python cli.py congress --aggregate            Overall congressional trading trends
+  python cli.py congress AVGO                   Congressional trades for Broadcom
+  python cli.py portfolio AAPL MSFT GOOGL       Portfolio correlation analysis
+  python cli.py sectors AAPL:100 JPM:50         Sector allocation analysis
+  python cli.py backtest                        Backtest congressional trading strategy
+  python cli.py sec NVDA                        SEC filings analysis (10-K, 10-Q)
+  python cli.py sec AAPL -q "risk factors"      Search SEC filings with query
+
+Environment Variables:
+  ANTHROPIC_API_KEY   Required for 'analyze' command
+  RAPIDAPI_KEY        Required for 'congress' and 'backtest' commands
+
+Profiling startup:
+  python -X importtime cli.py technicals AAPL 2> imports.log
+        """
+
+
+class _CLIParser(argparse.ArgumentParser):
+    """Top-level parser that attaches the examples epilog only when help is rendered"""
+
+    def format_help(self):
+        self.epilog = _EPILOG_TEXT
+        return super().format_help()
+
+
+def main():
+    # Version needs no parser at all
+    if sys.argv[1:] in (['--version'], ['-V']):
+        print(f"AutoInvestor CLI {__version__}")
+        return
+
+    _precompile_in_background()
+
+    parser = _CLIParser(
+        description="AutoInvestor CLI - AI-powered investment research",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+
+    parser.add_argument('--version', '-V', action='version',
+                        version=f"AutoInvestor CLI {__version__}")
+
+    subparsers = parser.add_subparsers(dest='command', help='Available commands',
+                                       parser_class=argparse.ArgumentParser)
+
+    # Only the invoked subcommand needs a parser; build them all for help/unknown input
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    if command in _SUBCOMMAND_PARSERS:
+        _SUBCOMMAND_PARSERS[command](subparsers)
+    else:
+        for add_parser in _SUBCOMMAND_PARSERS.values():
+            add_parser(subparsers)
+
     args = parser.parse_args()
 
     if args.command == 'analyze':
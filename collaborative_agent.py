@@ -11,13 +11,119 @@ Author: Lyra & Thomas
 Version: 1.0.0 - 2025-11-25
 """
 
+import io
 import os
+import re
 import json
-from typing import Dict, List, Optional, Any
+import time
+import hashlib
+import shelve
+import sys
+from collections.abc import Mapping
+from dataclasses import dataclass, field, fields
+from typing import Callable, Dict, Iterator, List, Optional, Any
 from datetime import datetime
 
 from autoinvestor_react import ReActAgent
 
+# Section headers in the synthesis answer (matched anywhere in a line, so
+# markdown like "**SYNTHESIS:**" still counts); "FINAL RECOMMENDATION:" is
+# covered by RECOMMENDATION
+_SECTION_RE = re.compile(r'(SYNTHESIS|RECOMMENDATION|ATTRIBUTION):', re.IGNORECASE)
+
+_json_decoder = json.JSONDecoder()
+
+# Optional on-disk cache of LLM responses, for repeated runs of the same
+# query during development. Off unless AUTOINVESTOR_LLM_CACHE=1; entries
+# expire after AUTOINVESTOR_LLM_CACHE_TTL seconds (default: one day).
+LLM_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'autoinvestor', 'llm_responses')
+LLM_CACHE_DEFAULT_TTL = 24 * 60 * 60
+
+# Bump when prompt templates change so stale responses are not reused
+PROMPT_VERSION = 1
+
+
+def _llm_cache_enabled() -> bool:
+    """Whether the on-disk LLM response cache is switched on"""
+    return os.environ.get('AUTOINVESTOR_LLM_CACHE', '0') == '1'
+
+
+def _llm_cache_ttl() -> float:
+    """Cache entry lifetime in seconds"""
+    try:
+        return float(os.environ.get('AUTOINVESTOR_LLM_CACHE_TTL', LLM_CACHE_DEFAULT_TTL))
+    except ValueError:
+        return LLM_CACHE_DEFAULT_TTL
+
+
+def _input_with_timeout(prompt: str, timeout: Optional[float]) -> str:
+    """
+    Read one line from stdin, giving up after timeout seconds
+
+    Returns the stripped line, or "" on timeout or end of input. Waiting
+    uses select(), which on Windows only supports sockets - there (and when
+    timeout is falsy) this falls back to a plain blocking input().
+    """
+    if not timeout or os.name == 'nt':
+        try:
+            return input(prompt).strip()
+        except EOFError:
+            return ""
+
+    import select
+
+    sys.stdout.write(prompt)
+    sys.stdout.flush()
+    try:
+        ready, _, _ = select.select([sys.stdin], [], [], timeout)
+    except (OSError, ValueError):
+        # stdin isn't selectable (e.g. replaced by a non-file object)
+        try:
+            return input().strip()
+        except EOFError:
+            return ""
+
+    if not ready:
+        sys.stdout.write(f"\n(no response after {timeout:g}s - skipping)\n")
+        return ""
+    return sys.stdin.readline().strip()
+
+
+@dataclass(slots=True)
+class CollaborativeResult(Mapping):
+    """
+    Result of a successful run_collaborative call
+
+    Fields are plain attributes; the read-only mapping interface keeps
+    existing dict-style access working (result['answer'], result.get(...),
+    dict(result) for JSON output).
+    """
+    success: bool
+    answer: str
+    collaborative_mode: bool = True
+    ai_analysis: str = ''
+    questions_asked: list = field(default_factory=list)
+    human_responses: list = field(default_factory=list)
+    synthesis_rationale: str = ''
+    iterations: int = 0
+    history: list = field(default_factory=list)
+    dialogue_history: list = field(default_factory=list)
+    timestamp: str = ''
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in _RESULT_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_RESULT_FIELDS)
+
+    def __len__(self) -> int:
+        return len(_RESULT_FIELDS)
+
+
+_RESULT_FIELDS = tuple(f.name for f in fields(CollaborativeResult))
+
 
 class CollaborativeAgent(ReActAgent):
     """
@@ -35,10 +141,53 @@ class CollaborativeAgent(ReActAgent):
         super().__init__(*args, **kwargs)
         self.dialogue_history = []
 
+    def _cached_llm_call(self, system: str, prompt: str, fn: Callable[[], str]) -> str:
+        """
+        Return fn()'s response text, reusing a cached one for the same inputs
+
+        The key covers everything that determines the request (model, system
+        prompt - which lists the registered tools - user prompt and prompt
+        version). Cache read/write failures fall through to a live call.
+
+        Args:
+            system: System prompt sent with the request
+            prompt: User prompt sent with the request
+            fn: Makes the live request and returns the response text
+
+        Returns:
+            Response text
+        """
+        if not _llm_cache_enabled():
+            return fn()
+
+        key = hashlib.sha256(
+            f"{PROMPT_VERSION}\0{self.model}\0{system}\0{prompt}".encode()
+        ).hexdigest()
+        now = time.time()
+
+        try:
+            with shelve.open(LLM_CACHE_PATH) as cache:
+                entry = cache.get(key)
+            if entry and now - entry[0] < _llm_cache_ttl():
+                return entry[1]
+        except Exception:
+            pass
+
+        text = fn()
+
+        try:
+            os.makedirs(os.path.dirname(LLM_CACHE_PATH), exist_ok=True)
+            with shelve.open(LLM_CACHE_PATH) as cache:
+                cache[key] = (now, text)
+        except Exception:
+            pass
+
+        return text
+
     def run_collaborative(self, user_query: str,
                          max_questions: int = 3,
                          verbose: bool = True,
-                         auto_timeout: int = 60) -> Dict[str, Any]:
+                         auto_timeout: int = 60) -> Mapping[str, Any]:
         """
         Run ReAct loop with collaborative dialogue phase
 
@@ -55,7 +204,8 @@ class CollaborativeAgent(ReActAgent):
             auto_timeout: Seconds to wait for human input before auto-proceeding
 
         Returns:
-            Dictionary with collaborative recommendation and metadata
+            CollaborativeResult with the recommendation and metadata, or the
+            analysis-phase error dict if analysis failed
         """
         # Phase 1: Standard ReAct analysis
         if verbose:
@@ -78,10 +228,14 @@ class CollaborativeAgent(ReActAgent):
             print(f"[Phase 2] Collaborative Dialogue - seeking human context...")
             print(f"{'='*80}\n")
 
+        # History is final after phase 1; both prompts below share one summary
+        analysis_summary = self._summarize_analysis()
+
         questions = self._generate_strategic_questions(
             user_query,
             analysis_result,
-            max_questions=max_questions
+            max_questions=max_questions,
+            analysis_summary=analysis_summary
         )
 
         if verbose:
@@ -97,7 +251,8 @@ class CollaborativeAgent(ReActAgent):
             print(f"Please provide your insights (or press Enter to skip):")
             print(f"{'='*80}\n")
 
-        human_responses = self._collect_human_input(questions, verbose=verbose)
+        human_responses = self._collect_human_input(questions, verbose=verbose,
+                                                    auto_timeout=auto_timeout)
 
         # Phase 4: Synthesize collaborative recommendation
         if verbose:
@@ -110,32 +265,36 @@ class CollaborativeAgent(ReActAgent):
             analysis_result,
             questions,
             human_responses,
-            verbose=verbose
+            verbose=verbose,
+            analysis_summary=analysis_summary
         )
 
-        return {
-            "success": True,
-            "answer": final_recommendation['answer'],
-            "collaborative_mode": True,
-            "ai_analysis": analysis_result['preliminary_answer'],
-            "questions_asked": questions,
-            "human_responses": human_responses,
-            "synthesis_rationale": final_recommendation['rationale'],
-            "iterations": analysis_result['iterations'],
-            "history": self.history,
-            "dialogue_history": self.dialogue_history,
-            "timestamp": datetime.now().isoformat()
-        }
+        return CollaborativeResult(
+            success=True,
+            answer=final_recommendation['answer'],
+            ai_analysis=analysis_result['preliminary_answer'],
+            questions_asked=questions,
+            human_responses=human_responses,
+            synthesis_rationale=final_recommendation['rationale'],
+            iterations=analysis_result['iterations'],
+            history=self.history,
+            dialogue_history=self.dialogue_history,
+            timestamp=datetime.now().isoformat()
+        )
 
     def _run_analysis_phase(self, user_query: str, verbose: bool = True) -> Dict:
         """
         Run ReAct analysis phase (gather data, don't finalize yet)
         """
-        self.history = []
+        self._reset_history()
 
-        for iteration in range(self.max_iterations):
-            system_prompt = self._build_system_prompt()
+        # Tools and model don't change between iterations
+        system_prompt = self._build_system_prompt()
 
+        # Tracked as it's recorded, so the fallback below needs no history scan
+        last_thought = None
+
+        for iteration in range(self.max_iterations):
             if iteration == 0:
                 user_prompt = f"""USER QUERY: {user_query}
 
@@ -153,26 +312,18 @@ Continue your research. Remember: gather data first, questions for human later."
             if verbose and iteration > 0:
                 print(f"\n--- Iteration {iteration + 1} ---")
 
-            # Get response from Claude
-            message = self.client.messages.create(
-                model=self.model,
-                max_tokens=2000,
-                system=system_prompt,
-                messages=[{"role": "user", "content": user_prompt}]
-            )
-
-            response = message.content[0].text
+            # Stream from Claude; closes as soon as a tool call is complete
+            response = self._cached_llm_call(
+                system_prompt, user_prompt,
+                lambda: self._get_response(system_prompt, user_prompt))
             thought, action, action_input = self._parse_response(response)
 
             if verbose and thought:
                 print(f"\nThought: {thought}")
 
             if thought:
-                self.history.append({
-                    "type": "thought",
-                    "content": thought,
-                    "iteration": iteration
-                })
+                last_thought = thought
+                self._record_thought(iteration, thought)
 
             # Execute action (if not FINAL_ANSWER)
             if action and action.upper() != "FINAL_ANSWER":
@@ -180,12 +331,7 @@ Continue your research. Remember: gather data first, questions for human later."
                     print(f"Action: {action}")
                     print(f"Input: {action_input}")
 
-                self.history.append({
-                    "type": "action",
-                    "tool": action,
-                    "input": action_input,
-                    "iteration": iteration
-                })
+                self._record_action(iteration, action, action_input)
 
                 # Execute tool
                 observation = self._execute_tool(action, action_input)
@@ -194,11 +340,7 @@ Continue your research. Remember: gather data first, questions for human later."
                     obs_preview = observation[:200] + "..." if len(observation) > 200 else observation
                     print(f"Observation: {obs_preview}\n")
 
-                self.history.append({
-                    "type": "observation",
-                    "content": observation,
-                    "iteration": iteration
-                })
+                self._record_observation(iteration, observation)
 
             elif action and action.upper() == "FINAL_ANSWER":
                 # Agent tried to finalize early - extract preliminary insights instead
@@ -209,8 +351,7 @@ Continue your research. Remember: gather data first, questions for human later."
                 }
 
         # Max iterations reached - extract what we have
-        last_thought = next((h for h in reversed(self.history) if h["type"] == "thought"), None)
-        preliminary = last_thought["content"] if last_thought else "Analysis incomplete"
+        preliminary = last_thought if last_thought else "Analysis incomplete"
 
         return {
             "success": True,
@@ -220,7 +361,8 @@ Continue your research. Remember: gather data first, questions for human later."
 
     def _generate_strategic_questions(self, user_query: str,
                                      analysis_result: Dict,
-                                     max_questions: int = 3) -> List[Dict]:
+                                     max_questions: int = 3,
+                                     analysis_summary: Optional[str] = None) -> List[Dict]:
         """
         Generate strategic questions for human based on AI analysis
 
@@ -231,7 +373,8 @@ Continue your research. Remember: gather data first, questions for human later."
         - Timing and market sentiment
         """
         # Build context from analysis history
-        analysis_summary = self._summarize_analysis()
+        if analysis_summary is None:
+            analysis_summary = self._summarize_analysis()
 
         prompt = f"""Based on my analysis of: {user_query}
 
@@ -262,26 +405,25 @@ Format as JSON array:
 
 Generate questions now:"""
 
-        message = self.client.messages.create(
+        system = "You are an AI investment analyst collaborating with a human. Generate strategic questions."
+        response = self._cached_llm_call(system, prompt, lambda: self.client.messages.create(
             model=self.model,
             max_tokens=1500,
-            system="You are an AI investment analyst collaborating with a human. Generate strategic questions.",
+            system=system,
             messages=[{"role": "user", "content": prompt}]
-        )
-
-        response = message.content[0].text.strip()
-
-        # Extract JSON from response
-        try:
-            # Find JSON array in response
-            start = response.find('[')
-            end = response.rfind(']') + 1
-            if start >= 0 and end > start:
-                json_str = response[start:end]
-                questions = json.loads(json_str)
+        ).content[0].text).strip()
+
+        # Decode the first JSON array in the response; raw_decode stops at the
+        # array's end, so prose before or after it doesn't break parsing
+        start = response.find('[')
+        while start >= 0:
+            try:
+                questions, _ = _json_decoder.raw_decode(response, start)
+            except ValueError:
+                questions = None
+            if isinstance(questions, list) and questions and all(isinstance(q, dict) for q in questions):
                 return questions[:max_questions]
-        except:
-            pass
+            start = response.find('[', start + 1)
 
         # Fallback: generic questions
         return [
@@ -303,17 +445,28 @@ Generate questions now:"""
         ][:max_questions]
 
     def _collect_human_input(self, questions: List[Dict],
-                            verbose: bool = True) -> List[Dict]:
+                            verbose: bool = True,
+                            auto_timeout: Optional[float] = None) -> List[Dict]:
         """
         Collect human responses to strategic questions
 
+        Args:
+            questions: Strategic questions to ask
+            verbose: Prompt interactively (silent mode skips every question)
+            auto_timeout: Seconds to wait for each answer before skipping it
+                          (None/0 waits indefinitely)
+
         Returns list of {question, response} dicts
         """
         responses = []
 
+        # One dialogue is a single collaborative session, so every answer in
+        # it shares the batch timestamp
+        now_iso = datetime.now().isoformat()
+
         for i, q in enumerate(questions, 1):
             if verbose:
-                response = input(f"\nQ{i}> ").strip()
+                response = _input_with_timeout(f"\nQ{i}> ", auto_timeout)
             else:
                 response = ""  # Silent mode for testing
 
@@ -328,7 +481,7 @@ Generate questions now:"""
                 "question_num": i,
                 "question": q['question'],
                 "response": response,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": now_iso
             })
 
         return responses
@@ -337,30 +490,23 @@ Generate questions now:"""
                                         analysis_result: Dict,
                                         questions: List[Dict],
                                         responses: List[Dict],
-                                        verbose: bool = True) -> Dict:
+                                        verbose: bool = True,
+                                        analysis_summary: Optional[str] = None) -> Dict:
         """
         Synthesize final recommendation incorporating AI analysis + human input
         """
         # Build synthesis prompt
-        analysis_summary = self._summarize_analysis()
-
-        dialogue_summary = "\n".join([
-            f"Q: {r['question']}\nHuman: {r['response']}"
-            for r in responses
-        ])
-
-        prompt = f"""INVESTMENT QUERY: {user_query}
-
-MY ANALYSIS:
-{analysis_summary}
-
-PRELIMINARY INSIGHT:
-{analysis_result['preliminary_answer']}
+        if analysis_summary is None:
+            analysis_summary = self._summarize_analysis()
 
-COLLABORATIVE DIALOGUE:
-{dialogue_summary}
+        # Skipped questions add nothing but prompt tokens
+        answered = [r for r in responses if not r.get('skipped')]
 
-Now provide a FINAL RECOMMENDATION that:
+        if answered:
+            dialogue_summary = "\n".join(
+                f"Q: {r['question']}\nHuman: {r['response']}" for r in answered
+            )
+            instructions = """Now provide a FINAL RECOMMENDATION that:
 1. Synthesizes my data analysis with the human's contextual insights
 2. Shows how the human input shaped or refined my conclusion
 3. Attributes insights appropriately ("Based on your [X]...", "You mentioned [Y], which...")
@@ -374,18 +520,40 @@ FINAL RECOMMENDATION:
 [Clear buy/sell/hold with reasoning]
 
 ATTRIBUTION:
-[How human input influenced the decision]
+[How human input influenced the decision]"""
+        else:
+            dialogue_summary = "[Human declined to answer strategic questions - proceed with AI analysis only]"
+            instructions = """Now provide a FINAL RECOMMENDATION based on the analysis alone.
+
+Use this format:
+SYNTHESIS:
+[Key points from the analysis]
+
+FINAL RECOMMENDATION:
+[Clear buy/sell/hold with reasoning]"""
+
+        prompt = f"""INVESTMENT QUERY: {user_query}
+
+MY ANALYSIS:
+{analysis_summary}
+
+PRELIMINARY INSIGHT:
+{analysis_result['preliminary_answer']}
+
+COLLABORATIVE DIALOGUE:
+{dialogue_summary}
+
+{instructions}
 
 Provide final answer now:"""
 
-        message = self.client.messages.create(
+        system = "You are an AI investment analyst providing collaborative recommendations."
+        final_answer = self._cached_llm_call(system, prompt, lambda: self.client.messages.create(
             model=self.model,
             max_tokens=2000,
-            system="You are an AI investment analyst providing collaborative recommendations.",
+            system=system,
             messages=[{"role": "user", "content": prompt}]
-        )
-
-        final_answer = message.content[0].text.strip()
+        ).content[0].text).strip()
 
         if verbose:
             print(f"\n{'='*80}")
@@ -394,62 +562,51 @@ Provide final answer now:"""
             print(final_answer)
             print(f"\n{'='*80}")
 
-        # Extract sections
-        synthesis = ""
-        recommendation = ""
-        attribution = ""
+        # Extract sections (collect lines, join once at the end)
+        sections = {'synthesis': [], 'recommendation': [], 'attribution': []}
 
-        lines = final_answer.split('\n')
         current_section = None
 
-        for line in lines:
-            if 'SYNTHESIS:' in line.upper():
-                current_section = 'synthesis'
-            elif 'FINAL RECOMMENDATION:' in line.upper() or 'RECOMMENDATION:' in line.upper():
-                current_section = 'recommendation'
-            elif 'ATTRIBUTION:' in line.upper():
-                current_section = 'attribution'
-            elif current_section == 'synthesis':
-                synthesis += line + '\n'
-            elif current_section == 'recommendation':
-                recommendation += line + '\n'
-            elif current_section == 'attribution':
-                attribution += line + '\n'
+        # Iterate lines in place rather than splitting the answer into a list;
+        # lines keep their newline, so sections are joined back with ''
+        for line in io.StringIO(final_answer):
+            header = _SECTION_RE.search(line)
+            if header:
+                current_section = header.group(1).lower()
+            elif current_section is not None:
+                sections[current_section].append(line)
 
         return {
             "answer": final_answer,
-            "synthesis": synthesis.strip(),
-            "recommendation": recommendation.strip(),
-            "attribution": attribution.strip(),
-            "rationale": f"Collaborative decision combining AI analysis across {analysis_result['iterations']} iterations with human insights on {len([r for r in responses if not r['skipped']])} strategic questions."
+            "synthesis": ''.join(sections['synthesis']).strip(),
+            "recommendation": ''.join(sections['recommendation']).strip(),
+            "attribution": ''.join(sections['attribution']).strip(),
+            "rationale": f"Collaborative decision combining AI analysis across {analysis_result['iterations']} iterations with human insights on {len(answered)} strategic questions."
         }
 
-    def _summarize_analysis(self) -> str:
+    def _summarize_analysis(self, max_findings: int = 5) -> str:
         """Create concise summary of analysis history"""
-        tools_used = set()
+        # Insertion-ordered set of tool names
+        tools_used = dict.fromkeys(tool for _, tool, _ in self.actions)
         key_findings = []
 
-        for item in self.history:
-            if item["type"] == "action":
-                tools_used.add(item["tool"])
-            elif item["type"] == "observation":
-                # Extract first 150 chars as key finding
-                obs = item["content"][:150].strip()
-                if obs:
-                    key_findings.append(obs)
-
-        summary = f"Tools used: {', '.join(tools_used)}\n\n"
-        summary += "Key findings:\n"
-        for finding in key_findings[:5]:  # Top 5 findings
-            summary += f"- {finding}...\n"
-
-        return summary
+        for _, observation in self.observations:
+            # Extract first 150 chars as key finding
+            obs = observation[:150].strip()
+            if obs:
+                key_findings.append(obs)
+                if len(key_findings) >= max_findings:
+                    break
+
+        return "".join([
+            f"Tools used: {', '.join(tools_used)}\n\n",
+            "Key findings:\n",
+            *(f"- {finding}...\n" for finding in key_findings),
+        ])
 
 
 if __name__ == "__main__":
     """Demo collaborative analysis"""
-    import sys
-
     # Initialize agent
     agent = CollaborativeAgent(
         api_key=os.environ.get("ANTHROPIC_API_KEY"),
@@ -19,12 +19,350 @@ Version: 2.0.0 - 2025-11-23
 import requests
 import json
 import os
-from typing import Dict, List, Optional
+import re
+import time
+import hashlib
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
 from datetime import datetime, timedelta
-from collections import defaultdict
+from collections import Counter, defaultdict
+from operator import itemgetter
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# orjson is optional - fall back to stdlib json if not installed
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# ijson is optional - streams trades out of the response instead of loading
+# the whole feed into memory at once
+try:
+    import ijson
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
+
+# msgspec is optional - keeps a MessagePack snapshot of the parsed trades next
+# to the raw response, which decodes much faster than re-parsing the JSON
+try:
+    import msgspec
+    HAS_MSGSPEC = True
+except ImportError:
+    HAS_MSGSPEC = False
+
+_JSON_ERRORS = (json.JSONDecodeError,)
+if HAS_IJSON:
+    _JSON_ERRORS += (ijson.JSONError,)
+if HAS_MSGSPEC:
+    _JSON_ERRORS += (msgspec.DecodeError,)
+
+RAPIDAPI_HOST = "politician-trade-tracker1.p.rapidapi.com"
+LATEST_TRADES_URL = f"https://{RAPIDAPI_HOST}/get_latest_trades"
+
+# Shared session so repeated lookups reuse the keep-alive connection instead
+# of a new TCP+TLS handshake per call; transient failures are retried with
+# backoff. The API key is sent per request since callers may pass their own.
+_SESSION = requests.Session()
+_SESSION.headers.update({"X-RapidAPI-Host": RAPIDAPI_HOST})
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+))
+
+# On-disk cache of raw API response bodies (freshness from file mtime). The
+# latest-trades feed is the same for every ticker, so one cached response
+# serves all lookups until it expires; STOCK Act disclosures trickle in
+# slowly, so a few hours' staleness is fine and keeps repeat queries within
+# the free-tier quota. Responses are streamed straight into this file and
+# parsed from it, so the body is never held in memory as a whole. Once
+# expired, the cached body is revalidated with the ETag/Last-Modified saved
+# beside it, so an unchanged feed costs a 304 instead of a full download.
+TRADES_CACHE_DIR = Path(__file__).parent / '.cache' / 'congressional_trades'
+TRADES_CACHE_TTL = 6 * 60 * 60
+
+
+# Above this many trades _analyze_trades counts column-wise; below it the
+# per-row loop is just as fast
+VECTORIZE_MIN_TRADES = 200
+
+# Placeholder tickers the feed uses for non-equity or unidentified assets
+NA_TICKERS = frozenset({'N/A', ''})
+
+# Month names for trade_date strings like "October 27, 2025"
+_MONTHS = {
+    'january': 1, 'february': 2, 'march': 3, 'april': 4, 'may': 5, 'june': 6, 'july': 7,
+    'august': 8, 'september': 9, 'october': 10, 'november': 11, 'december': 12
+}
+
+
+def _parse_trade_date(date_str: str) -> Optional[datetime]:
+    """
+    Parse an API trade date ("October 27, 2025"), or None if malformed
+
+    Accepts the same strings as strptime('%B %d, %Y') (plus surrounding
+    whitespace) without re-parsing the format for every trade.
+    """
+    parts = date_str.split()
+    if len(parts) != 3 or not parts[1].endswith(','):
+        return None
+
+    month = _MONTHS.get(parts[0].lower())
+    day, year = parts[1][:-1], parts[2]
+    if month is None or not (day.isdigit() and len(day) <= 2 and year.isdigit() and len(year) == 4):
+        return None
+
+    try:
+        return datetime(int(year), month, int(day))
+    except ValueError:
+        return None
+
+
+# Transaction type keywords (one case-insensitive scan per side, no lowercased copy)
+_BUY_RE = re.compile(r'purchase|buy', re.IGNORECASE)
+_SELL_RE = re.compile(r'sale|sell', re.IGNORECASE)
+
+
+def trade_side(transaction_type: Optional[str]) -> str:
+    """Classify a transaction type as 'buy', 'sell' or 'other'"""
+    transaction_type = transaction_type or ''
+    if _BUY_RE.search(transaction_type):
+        return 'buy'
+    if _SELL_RE.search(transaction_type):
+        return 'sell'
+    return 'other'
+
+
+def _trades_cache_path(url: str) -> Path:
+    """Cache file holding the raw response body for url"""
+    return TRADES_CACHE_DIR / f"{hashlib.md5(url.encode()).hexdigest()}.raw.json"
+
+
+def _is_fresh(path: Path, ttl: float = TRADES_CACHE_TTL) -> bool:
+    """Whether a cached response exists and is younger than ttl seconds"""
+    try:
+        return time.time() - path.stat().st_mtime < ttl
+    except OSError:
+        return False
+
+
+def _validators_path(path: Path) -> Path:
+    """Sidecar holding the ETag/Last-Modified headers for the body at path"""
+    return path.with_suffix('.meta')
+
+
+def _conditional_headers(path: Path) -> Dict[str, str]:
+    """If-None-Match/If-Modified-Since headers for revalidating path, if any"""
+    try:
+        validators = json.loads(_validators_path(path).read_text())
+        if not path.exists():
+            return {}
+    except (OSError, ValueError):
+        return {}
+
+    headers = {}
+    if validators.get('etag'):
+        headers['If-None-Match'] = validators['etag']
+    if validators.get('last_modified'):
+        headers['If-Modified-Since'] = validators['last_modified']
+    return headers
+
+
+def _touch_cached_trades(path: Path):
+    """Mark the cached body at path (and a current snapshot of it) as fresh"""
+    packed = _packed_cache_path(path)
+    try:
+        snapshot_current = packed.stat().st_mtime >= path.stat().st_mtime
+    except OSError:
+        snapshot_current = False
+
+    os.utime(path)
+    if snapshot_current:
+        # Touched after the body so it still counts as built from it
+        os.utime(packed)
 
 
-def get_congressional_trades(ticker: str, days: int = 90, chamber: str = "both", api_key: Optional[str] = None) -> Dict:
+def _download_latest_trades(api_key: str, path: Path, revalidate: bool = True):
+    """
+    Stream the latest-trades response body into path (atomic replace)
+
+    Args:
+        revalidate: Send the previous response's ETag/Last-Modified so an
+                    unchanged feed comes back as a 304 and the cached body
+                    is reused without transferring or parsing it again
+    """
+    # Host header comes from the session
+    headers = {"X-RapidAPI-Key": api_key}
+    if revalidate:
+        headers.update(_conditional_headers(path))
+
+    with _SESSION.get(LATEST_TRADES_URL, headers=headers, timeout=15, stream=True) as response:
+        if response.status_code == 304:
+            _touch_cached_trades(path)
+            return
+        response.raise_for_status()
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.tmp')
+        with open(tmp, 'wb') as f:
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                f.write(chunk)
+        os.replace(tmp, path)
+
+        validators = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified')
+        }
+
+    meta = _validators_path(path)
+    if validators['etag'] or validators['last_modified']:
+        meta.write_text(json.dumps(validators))
+    else:
+        try:
+            meta.unlink()
+        except OSError:
+            pass
+
+
+def _packed_cache_path(path: Path) -> Path:
+    """MessagePack snapshot of the trades parsed from the raw body at path"""
+    return path.with_suffix('.msgpack')
+
+
+def _load_packed_trades(path: Path) -> List[Dict]:
+    """
+    Trades from the raw body at path via its MessagePack snapshot
+
+    The snapshot is rebuilt whenever it is older than the raw body, so a
+    fresh download is parsed once and every cache hit after that skips
+    JSON decoding.
+    """
+    packed = _packed_cache_path(path)
+    try:
+        if packed.stat().st_mtime >= path.stat().st_mtime:
+            return msgspec.msgpack.decode(packed.read_bytes())
+    except OSError:
+        pass
+
+    data = msgspec.json.decode(path.read_bytes())
+    trades = data if isinstance(data, list) else data.get('trades', [])
+
+    tmp = packed.with_name(packed.name + '.tmp')
+    tmp.write_bytes(msgspec.msgpack.encode(trades))
+    os.replace(tmp, packed)
+    return trades
+
+
+def _iter_trades(path: Path) -> Iterator[Dict]:
+    """
+    Yield trade dicts from a saved response body
+
+    The feed is either a bare list of trades or {"trades": [...]}. With
+    msgspec the trades come from a MessagePack snapshot of the body; with
+    ijson they are decoded one at a time; otherwise the whole body is
+    parsed (orjson when available). orjson.JSONDecodeError subclasses
+    json.JSONDecodeError, so _JSON_ERRORS covers every backend.
+    """
+    if HAS_MSGSPEC:
+        yield from _load_packed_trades(path)
+        return
+
+    if HAS_IJSON:
+        with open(path, 'rb') as f:
+            head = f.read(64).lstrip()
+            f.seek(0)
+            prefix = 'item' if head.startswith(b'[') else 'trades.item'
+            yield from ijson.items(f, prefix, use_float=True)
+        return
+
+    body = path.read_bytes()
+    data = orjson.loads(body) if HAS_ORJSON else json.loads(body)
+    yield from data if isinstance(data, list) else data.get('trades', [])
+
+
+class _TradeTally:
+    """
+    Running aggregate of trades for the analysis summary
+
+    Lets callers that only need the summary count rows as they are read
+    from the feed instead of building a full dict per trade first.
+    """
+
+    __slots__ = ('purchases', 'sales', 'total', 'politicians', 'party_counts',
+                 'chamber_counts', 'recent_cutoff', 'recent_count')
+
+    def __init__(self):
+        self.purchases = 0
+        self.sales = 0
+        self.total = 0
+        self.politicians = set()
+        self.party_counts = defaultdict(int)
+        self.chamber_counts = defaultdict(int)
+        # transaction_date is ISO YYYY-MM-DD, which orders correctly as a plain
+        # string; a trade dated on the cutoff day itself (midnight) falls
+        # before the cutoff time
+        self.recent_cutoff = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
+        self.recent_count = 0
+
+    def add(self, side: str, politician: str, party: str, chamber: str, transaction_date: str):
+        """Count one trade"""
+        self.total += 1
+        if side == 'buy':
+            self.purchases += 1
+        elif side == 'sell':
+            self.sales += 1
+
+        self.politicians.add(politician)
+        self.party_counts[party] += 1
+        self.chamber_counts[chamber] += 1
+
+        if transaction_date > self.recent_cutoff:
+            self.recent_count += 1
+
+    def analysis(self) -> Dict:
+        """Analysis summary for the trades counted so far"""
+        if not self.total:
+            return {
+                "sentiment": "NO DATA - No congressional trades found for this ticker",
+                "recent_activity": "No trades found",
+                "total_trades": 0,
+                "purchases": 0,
+                "sales": 0,
+                "unique_politicians": 0,
+                "party_breakdown": {},
+                "chamber_breakdown": {}
+            }
+
+        purchases, sales = self.purchases, self.sales
+
+        # Determine sentiment
+        if purchases > sales:
+            sentiment = f"BULLISH - More purchases ({purchases}) than sales ({sales})"
+        elif sales > purchases:
+            sentiment = f"BEARISH - More sales ({sales}) than purchases ({purchases})"
+        else:
+            sentiment = f"NEUTRAL - Equal purchases and sales ({purchases} each)"
+
+        recent_count = self.recent_count
+        recent_activity = f"{recent_count} trade(s) in last 30 days" if recent_count else "No trades in last 30 days"
+
+        return {
+            "sentiment": sentiment,
+            "recent_activity": recent_activity,
+            "total_trades": self.total,
+            "purchases": purchases,
+            "sales": sales,
+            "unique_politicians": len(self.politicians),
+            "party_breakdown": dict(self.party_counts),
+            "chamber_breakdown": dict(self.chamber_counts)
+        }
+
+
+def get_congressional_trades(ticker: str, days: int = 90, chamber: str = "both", api_key: Optional[str] = None,
+                             cache: bool = True, summary_only: bool = False) -> Dict:
     """
     Get recent congressional trades for a specific stock ticker
 
@@ -32,6 +370,11 @@ def get_congressional_trades(ticker: str, days: int = 90, chamber: str = "both",
         ticker: Stock symbol (e.g., 'AAPL', 'TSLA')
         days: Number of days to look back (default: 90)
         chamber: Which chamber to query - 'house', 'senate', or 'both' (default: 'both')
+        api_key: RapidAPI key (or set RAPIDAPI_KEY env var)
+        cache: Reuse an API response cached within TRADES_CACHE_TTL (default: True)
+        summary_only: Only compute the analysis; matching trades are counted as
+                      they are read and "trades" is returned empty (for batch
+                      scans that only need sentiment)
 
     Returns:
         Dict containing congressional trading data with politician details
@@ -49,118 +392,224 @@ def get_congressional_trades(ticker: str, days: int = 90, chamber: str = "both",
         }
 
     try:
+        if summary_only:
+            tally = _TradeTally()
+            _, error = _fetch_trades_rapidapi(ticker, days, api_key, use_cache=cache,
+                                              tally=tally, chamber=chamber)
+            if error:
+                return {"error": error}
+            return _summary_result(ticker, days, chamber, tally)
+
         # Fetch all recent trades from RapidAPI
-        trades, error = _fetch_trades_rapidapi(ticker, days, api_key)
+        trades, error = _fetch_trades_rapidapi(ticker, days, api_key, use_cache=cache)
 
         if error:
             return {"error": error}
 
-        # Filter by chamber if specified
-        if chamber != "both":
-            trades = [t for t in trades if t['chamber'].lower() == chamber.lower()]
+        return _trades_result(ticker, days, chamber, trades)
 
-        # Sort trades by date (most recent first)
-        trades.sort(key=lambda x: x.get('transaction_date', ''), reverse=True)
+    except Exception as e:
+        return {"error": f"Failed to fetch congressional trades: {str(e)}"}
 
-        # Analyze trades
-        analysis = _analyze_trades(trades, ticker)
 
+def scan_tickers(tickers: List[str], days: int = 90, chamber: str = "both", api_key: Optional[str] = None,
+                 cache: bool = True, summary_only: bool = False) -> Dict:
+    """
+    Get congressional trades for several tickers from one pass over the feed
+
+    The latest-trades feed is the same for every ticker, so a watchlist scan
+    fetches (or loads from cache) and decodes it once, routing each row to
+    its ticker, instead of once per get_congressional_trades call.
+
+    Args:
+        tickers: Stock symbols to look up
+        days, chamber, api_key, cache, summary_only: As for get_congressional_trades
+
+    Returns:
+        Dict mapping each (normalized) ticker to the same result
+        get_congressional_trades would return for it, or {"error": ...}
+    """
+    tickers = list(dict.fromkeys(t.upper().strip() for t in tickers))
+
+    # Get API key from parameter or environment
+    if api_key is None:
+        api_key = os.environ.get('RAPIDAPI_KEY')
+
+    if not api_key:
         return {
-            "ticker": ticker,
-            "days_queried": days,
-            "chamber": chamber,
-            "total_trades": len(trades),
-            "trades": trades,
-            "analysis": analysis
+            "error": "API key required. Set RAPIDAPI_KEY environment variable or pass api_key parameter. "
+                    "Get free API key at: https://rapidapi.com/politics-trackers-politics-trackers-default/api/politician-trade-tracker"
         }
 
+    try:
+        if summary_only:
+            tallies = {ticker: _TradeTally() for ticker in tickers}
+            _, error = _fetch_trades_for_tickers(tickers, days, api_key, use_cache=cache,
+                                                 tallies=tallies, chamber=chamber)
+            if error:
+                return {"error": error}
+            return {ticker: _summary_result(ticker, days, chamber, tally)
+                    for ticker, tally in tallies.items()}
+
+        trades_by_ticker, error = _fetch_trades_for_tickers(tickers, days, api_key, use_cache=cache)
+        if error:
+            return {"error": error}
+        return {ticker: _trades_result(ticker, days, chamber, trades)
+                for ticker, trades in trades_by_ticker.items()}
+
     except Exception as e:
         return {"error": f"Failed to fetch congressional trades: {str(e)}"}
 
 
-def _fetch_trades_rapidapi(ticker: str, days: int, api_key: str) -> tuple:
+def _trades_result(ticker: str, days: int, chamber: str, trades: List[Dict]) -> Dict:
+    """Filter, sort and analyze one ticker's matching trades into the result dict"""
+    # Filter by chamber if specified
+    if chamber != "both":
+        target_chamber = chamber.lower()
+        trades = [t for t in trades if t['chamber'].lower() == target_chamber]
+
+    # Sort trades by date (most recent first); every row has an ISO
+    # transaction_date, which sorts correctly as a string
+    trades.sort(key=itemgetter('transaction_date'), reverse=True)
+
+    # Analyze trades
+    analysis = _analyze_trades(trades, ticker)
+
+    return {
+        "ticker": ticker,
+        "days_queried": days,
+        "chamber": chamber,
+        "total_trades": len(trades),
+        "trades": trades,
+        "analysis": analysis
+    }
+
+
+def _summary_result(ticker: str, days: int, chamber: str, tally: _TradeTally) -> Dict:
+    """Result dict for a summary_only lookup (no individual trades)"""
+    return {
+        "ticker": ticker,
+        "days_queried": days,
+        "chamber": chamber,
+        "total_trades": tally.total,
+        "trades": [],
+        "analysis": tally.analysis()
+    }
+
+
+def _fetch_trades_rapidapi(ticker: str, days: int, api_key: str, use_cache: bool = True,
+                           tally: Optional[_TradeTally] = None, chamber: str = "both") -> tuple:
     """
     Fetch congressional trades from RapidAPI Politician Trade Tracker
 
+    Args:
+        use_cache: Serve the response from the on-disk cache when fresh
+                   (a live fetch refreshes the cache either way)
+        tally: If given, matching trades from the given chamber are counted
+               into it instead of being returned (trades_list stays empty)
+        chamber: Chamber filter applied when tallying ('both' keeps all)
+
     Returns:
         Tuple of (trades_list, error_message)
     """
-    try:
-        # RapidAPI endpoint for latest trades
-        url = "https://politician-trade-tracker1.p.rapidapi.com/get_latest_trades"
+    trades_by_ticker, error = _fetch_trades_for_tickers(
+        [ticker], days, api_key, use_cache=use_cache,
+        tallies={ticker: tally} if tally is not None else None, chamber=chamber)
+    return (trades_by_ticker.get(ticker, []), error)
 
-        headers = {
-            "X-RapidAPI-Key": api_key,
-            "X-RapidAPI-Host": "politician-trade-tracker1.p.rapidapi.com"
-        }
 
-        # Make request
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()
+def _fetch_trades_for_tickers(tickers: List[str], days: int, api_key: str, use_cache: bool = True,
+                              tallies: Optional[Dict[str, _TradeTally]] = None,
+                              chamber: str = "both") -> tuple:
+    """
+    Collect matching trades for several tickers in one pass over the feed
 
-        all_trades_data = response.json()
+    Args:
+        tickers: Normalized (upper-case) symbols to match
+        use_cache: As for _fetch_trades_rapidapi
+        tallies: If given, {ticker: tally}; matching trades from the given
+                 chamber are counted into them instead of being returned
+        chamber: Chamber filter applied when tallying ('both' keeps all)
+
+    Returns:
+        Tuple of ({ticker: trades_list}, error_message)
+    """
+    matching_trades = {ticker: [] for ticker in tickers}
+    path = _trades_cache_path(LATEST_TRADES_URL)
+    try:
+        if not (use_cache and _is_fresh(path)):
+            _download_latest_trades(api_key, path, revalidate=use_cache)
 
         # Filter by ticker and date
         cutoff_date = datetime.now() - timedelta(days=days)
-        matching_trades = []
+        target_chamber = chamber.lower()
+
+        for trade in _iter_trades(path):
+            # Check the ticker first: most of the feed is other tickers, so
+            # this skips the date parse for nearly every row
+            # Extract ticker (format: "NWL:US" -> "NWL")
+            trade_ticker = (trade.get('ticker') or '').upper().strip().partition(':')[0]
 
-        # Parse response structure (adjust based on actual API response)
-        trades_list = all_trades_data if isinstance(all_trades_data, list) else all_trades_data.get('trades', [])
+            # Skip if ticker isn't requested or is a placeholder
+            if trade_ticker not in matching_trades or trade_ticker in NA_TICKERS:
+                continue
 
-        for trade in trades_list:
             # Parse transaction date (format: "October 27, 2025")
-            try:
-                trans_date_str = trade.get('trade_date', '')
-                trans_date = datetime.strptime(trans_date_str, '%B %d, %Y')
-            except (ValueError, TypeError):
+            trans_date_str = trade.get('trade_date', '')
+            trans_date = _parse_trade_date(trans_date_str) if isinstance(trans_date_str, str) else None
+            if trans_date is None:
                 continue
 
             # Check if within date range
             if trans_date < cutoff_date:
                 continue
 
-            # Extract ticker (format: "NWL:US" -> "NWL")
-            trade_ticker_raw = trade.get('ticker', '').upper().strip()
-            if ':' in trade_ticker_raw:
-                trade_ticker = trade_ticker_raw.split(':')[0]
-            else:
-                trade_ticker = trade_ticker_raw
-
-            # Skip if ticker is N/A or doesn't match
-            if trade_ticker == 'N/A' or not trade_ticker:
+            transaction_type = trade.get('trade_type', 'Unknown')
+
+            if tallies is not None:
+                trade_chamber = trade.get('chamber', 'Unknown')
+                if target_chamber == "both" or trade_chamber.lower() == target_chamber:
+                    tallies[trade_ticker].add(trade_side(transaction_type), trade.get('name', 'Unknown'),
+                              trade.get('party', 'Unknown'), trade_chamber,
+                              trans_date.strftime('%Y-%m-%d'))
                 continue
 
-            if trade_ticker == ticker:
-                # Calculate disclosure date from days_until_disclosure
-                days_until = trade.get('days_until_disclosure', 0)
-                try:
-                    disclosure_date = (trans_date + timedelta(days=days_until)).strftime('%Y-%m-%d')
-                except:
-                    disclosure_date = 'Unknown'
-
-                matching_trades.append({
-                    'chamber': trade.get('chamber', 'Unknown'),
-                    'politician': trade.get('name', 'Unknown'),
-                    'party': trade.get('party', 'Unknown'),
-                    'state': f"{trade.get('state_name', trade.get('state_abbreviation', 'Unknown'))}",
-                    'transaction_date': trans_date.strftime('%Y-%m-%d'),
-                    'disclosure_date': disclosure_date,
-                    'ticker': trade_ticker,
-                    'asset_description': trade.get('company', 'Unknown'),
-                    'transaction_type': trade.get('trade_type', 'Unknown'),
-                    'amount': trade.get('trade_amount', 'Unknown'),
-                    'owner': 'Self',  # API doesn't provide owner field
-                    'ptr_link': ''  # API doesn't provide PTR links
-                })
+            # Calculate disclosure date from days_until_disclosure
+            days_until = trade.get('days_until_disclosure', 0)
+            try:
+                disclosure_date = (trans_date + timedelta(days=days_until)).strftime('%Y-%m-%d')
+            except:
+                disclosure_date = 'Unknown'
+
+            matching_trades[trade_ticker].append({
+                'chamber': trade.get('chamber', 'Unknown'),
+                'politician': trade.get('name', 'Unknown'),
+                'party': trade.get('party', 'Unknown'),
+                'state': trade.get('state_name') or trade.get('state_abbreviation') or 'Unknown',
+                'transaction_date': trans_date.strftime('%Y-%m-%d'),
+                'disclosure_date': disclosure_date,
+                'ticker': trade_ticker,
+                'asset_description': trade.get('company', 'Unknown'),
+                'transaction_type': transaction_type,
+                'amount': trade.get('trade_amount', 'Unknown'),
+                'owner': 'Self',  # API doesn't provide owner field
+                'ptr_link': ''  # API doesn't provide PTR links
+            })
 
         return (matching_trades, None)
 
     except requests.RequestException as e:
-        return ([], f"API request failed: {str(e)}")
-    except json.JSONDecodeError as e:
-        return ([], f"Failed to parse API response: {str(e)}")
+        return ({}, f"API request failed: {str(e)}")
+    except _JSON_ERRORS as e:
+        # Don't keep serving a bad body from the cache
+        for stale in (path, _packed_cache_path(path), _validators_path(path)):
+            try:
+                stale.unlink()
+            except OSError:
+                pass
+        return ({}, f"Failed to parse API response: {str(e)}")
     except Exception as e:
-        return ([], f"Unexpected error: {str(e)}")
+        return ({}, f"Unexpected error: {str(e)}")
 
 
 def _analyze_trades(trades: List[Dict], ticker: str) -> Dict:
@@ -170,99 +619,48 @@ def _analyze_trades(trades: List[Dict], ticker: str) -> Dict:
     Returns:
         Dict with analysis summary
     """
-    if not trades:
-        return {
-            "sentiment": "NO DATA - No congressional trades found for this ticker",
-            "recent_activity": "No trades found",
-            "total_trades": 0,
-            "purchases": 0,
-            "sales": 0,
-            "unique_politicians": 0,
-            "party_breakdown": {},
-            "chamber_breakdown": {}
-        }
-
-    # Count transaction types
-    purchases = sum(1 for t in trades if 'purchase' in t['transaction_type'].lower() or 'buy' in t['transaction_type'].lower())
-    sales = sum(1 for t in trades if 'sale' in t['transaction_type'].lower() or 'sell' in t['transaction_type'].lower())
-
-    # Get unique politicians
-    unique_pols = len(set(t['politician'] for t in trades))
+    tally = _TradeTally()
 
-    # Party breakdown
-    party_counts = defaultdict(int)
-    for trade in trades:
-        party = trade.get('party', 'Unknown')
-        party_counts[party] += 1
-
-    # Chamber breakdown
-    chamber_counts = defaultdict(int)
-    for trade in trades:
-        chamber = trade.get('chamber', 'Unknown')
-        chamber_counts[chamber] += 1
-
-    # Determine sentiment
-    if purchases > sales:
-        sentiment = f"BULLISH - More purchases ({purchases}) than sales ({sales})"
-    elif sales > purchases:
-        sentiment = f"BEARISH - More sales ({sales}) than purchases ({purchases})"
-    else:
-        sentiment = f"NEUTRAL - Equal purchases and sales ({purchases} each)"
+    if len(trades) > VECTORIZE_MIN_TRADES:
+        _tally_columns(tally, trades)
+        return tally.analysis()
 
-    # Recent activity (last 30 days)
-    recent_cutoff = datetime.now() - timedelta(days=30)
-    recent_trades = []
+    # Single pass over the trades
     for trade in trades:
-        try:
-            trans_date = datetime.strptime(trade['transaction_date'], '%Y-%m-%d')
-            if trans_date >= recent_cutoff:
-                recent_trades.append(trade)
-        except:
-            continue
+        tally.add(trade_side(trade['transaction_type']),
+                  trade['politician'],
+                  trade.get('party', 'Unknown'),
+                  trade.get('chamber', 'Unknown'),
+                  trade['transaction_date'])
+    return tally.analysis()
 
-    recent_activity = f"{len(recent_trades)} trade(s) in last 30 days" if recent_trades else "No trades in last 30 days"
 
-    return {
-        "sentiment": sentiment,
-        "recent_activity": recent_activity,
-        "total_trades": len(trades),
-        "purchases": purchases,
-        "sales": sales,
-        "unique_politicians": unique_pols,
-        "party_breakdown": dict(party_counts),
-        "chamber_breakdown": dict(chamber_counts)
-    }
-
-
-def analyze_congressional_trades(ticker: str, days: int = 90, chamber: str = "both", api_key: Optional[str] = None) -> Dict:
+def _tally_columns(tally: _TradeTally, trades: List[Dict]):
     """
-    Main interface for congressional trading analysis with human-readable output
+    Fill tally from the trades one column at a time
 
-    Args:
-        ticker: Stock symbol to analyze
-        days: Number of days to look back
-        chamber: 'house', 'senate', or 'both'
-        api_key: RapidAPI key (or set RAPIDAPI_KEY env var)
-
-    Returns:
-        Dict with formatted summary and raw data
+    Equivalent to calling tally.add() per trade, but each column is pulled
+    out once and counted by C-level Counter/list/set operations instead of
+    per-row Python bookkeeping. Counter keeps first-appearance order, like
+    the row loop's breakdowns.
     """
-    result = get_congressional_trades(ticker, days, chamber, api_key)
+    sides = [trade_side(t['transaction_type']) for t in trades]
+    recent_cutoff = tally.recent_cutoff
 
-    if "error" in result:
-        return result
+    tally.total = len(trades)
+    tally.purchases = sides.count('buy')
+    tally.sales = sides.count('sell')
+    tally.politicians = set(map(itemgetter('politician'), trades))
+    tally.party_counts = Counter(t.get('party', 'Unknown') for t in trades)
+    tally.chamber_counts = Counter(t.get('chamber', 'Unknown') for t in trades)
+    tally.recent_count = sum(date > recent_cutoff for date in map(itemgetter('transaction_date'), trades))
 
-    # Generate timestamp
-    analysis_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')
 
-    # Format summary
-    summary = f"""
-Congressional Trading Activity for {result['ticker']}
-Analysis Timestamp: {analysis_time}
-Query Period: Last {result['days_queried']} days
-Chamber: {result['chamber'].title()}
+# Trades listed individually in the summary (the rest are in raw_data)
+SUMMARY_MAX_TRADES = 20
 
-DATA SOURCES & VERIFICATION:
+# Fixed sections of the analyze_congressional_trades summary
+_SUMMARY_SOURCES = """DATA SOURCES & VERIFICATION:
 - API: Politician Trade Tracker via RapidAPI
 - Get API key: https://rapidapi.com/politics-trackers-politics-trackers-default/api/politician-trade-tracker
 - Original Filings: PTR (Periodic Transaction Report) links provided below
@@ -272,16 +670,9 @@ DATA SOURCES & VERIFICATION:
 LEGAL CONTEXT:
 The STOCK Act (Stop Trading on Congressional Knowledge Act) requires all members of
 Congress to publicly disclose stock transactions within 45 days. This data is sourced
-from official government disclosures and maintained by House/Senate Stock Watcher.
+from official government disclosures and maintained by House/Senate Stock Watcher."""
 
-ANALYSIS SUMMARY:
-Total Trades Found: {result['total_trades']}
-{_format_analysis_summary(result['analysis'])}
-
-DETAILED TRADES:
-{_format_trades_list(result['trades'])}
-
-IMPORTANT DISCLAIMER:
+_SUMMARY_DISCLAIMER = """IMPORTANT DISCLAIMER:
 This congressional trading data is for informational and transparency purposes only.
 It should NOT be considered financial advice or a recommendation to buy or sell any
 security. Congressional trades are disclosed 0-45 days after execution, so this data
@@ -292,13 +683,54 @@ of congressional trading activity does not guarantee any particular outcome. Con
 a licensed financial advisor before making investment decisions.
 
 This tool democratizes publicly available information but does not constitute insider
-information or a trading signal. Use as one of many factors in your research.
-"""
+information or a trading signal. Use as one of many factors in your research."""
+
+
+def analyze_congressional_trades(ticker: str, days: int = 90, chamber: str = "both", api_key: Optional[str] = None) -> Dict:
+    """
+    Main interface for congressional trading analysis with human-readable output
+
+    Args:
+        ticker: Stock symbol to analyze
+        days: Number of days to look back
+        chamber: 'house', 'senate', or 'both'
+        api_key: RapidAPI key (or set RAPIDAPI_KEY env var)
+
+    Returns:
+        Dict with formatted summary and raw data
+    """
+    result = get_congressional_trades(ticker, days, chamber, api_key)
+
+    if "error" in result:
+        return result
+
+    # Generate timestamp
+    analysis_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')
+
+    # Assemble the summary from its sections and join once
+    parts = [
+        f"Congressional Trading Activity for {result['ticker']}",
+        f"Analysis Timestamp: {analysis_time}",
+        f"Query Period: Last {result['days_queried']} days",
+        f"Chamber: {result['chamber'].title()}",
+        "",
+        _SUMMARY_SOURCES,
+        "",
+        "ANALYSIS SUMMARY:",
+        f"Total Trades Found: {result['total_trades']}",
+        _format_analysis_summary(result['analysis']),
+        "",
+        "DETAILED TRADES:",
+        _format_trades_list(result['trades']),
+        "",
+        _SUMMARY_DISCLAIMER,
+    ]
 
     if result.get('errors'):
-        summary += f"\n\nNOTE: Some data sources encountered errors:\n"
-        for error in result['errors']:
-            summary += f"- {error}\n"
+        parts.extend(["", "", "NOTE: Some data sources encountered errors:"])
+        parts.extend(f"- {error}" for error in result['errors'])
+
+    summary = '\n'.join(parts)
 
     return {
         "summary": summary.strip(),
@@ -340,23 +772,25 @@ def _format_trades_list(trades: List[Dict]) -> str:
     if not trades:
         return "No trades found for this ticker in the specified time period."
 
+    # Limit to the 20 most recent trades in the summary
+    displayed = trades[:SUMMARY_MAX_TRADES]
+    remaining = len(trades) - len(displayed)
+
     lines = []
-    for i, trade in enumerate(trades, 1):
-        lines.append(f"\n{i}. {trade['politician']} ({trade['party']}-{trade['state']}) - {trade['chamber']}")
-        lines.append(f"   Transaction Date: {trade['transaction_date']}")
-        lines.append(f"   Disclosed: {trade['disclosure_date']}")
-        lines.append(f"   Type: {trade['transaction_type']}")
-        lines.append(f"   Amount: {trade['amount']}")
-        lines.append(f"   Asset: {trade['asset_description']}")
-        lines.append(f"   Owner: {trade['owner']}")
-        if trade.get('ptr_link'):
-            lines.append(f"   PTR Filing: {trade['ptr_link']}")
-
-        if i >= 20:  # Limit to 20 most recent trades in summary
-            remaining = len(trades) - 20
-            if remaining > 0:
-                lines.append(f"\n... and {remaining} more trade(s). See raw_data for complete list.")
-            break
+    for i, trade in enumerate(displayed, 1):
+        ptr_line = f"\n   PTR Filing: {trade['ptr_link']}" if trade.get('ptr_link') else ""
+        lines.append(
+            f"\n{i}. {trade['politician']} ({trade['party']}-{trade['state']}) - {trade['chamber']}\n"
+            f"   Transaction Date: {trade['transaction_date']}\n"
+            f"   Disclosed: {trade['disclosure_date']}\n"
+            f"   Type: {trade['transaction_type']}\n"
+            f"   Amount: {trade['amount']}\n"
+            f"   Asset: {trade['asset_description']}\n"
+            f"   Owner: {trade['owner']}{ptr_line}"
+        )
+
+    if remaining:
+        lines.append(f"\n... and {remaining} more trade(s). See raw_data for complete list.")
 
     return '\n'.join(lines)
 
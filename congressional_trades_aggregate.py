@@ -14,10 +14,55 @@ Version: 1.0.0 - 2025-11-25
 import requests
 import json
 import os
+import re
+import time
 import yfinance as yf
+from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 from collections import defaultdict, Counter
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from congressional_trades import trade_side
+
+# orjson is optional - fall back to stdlib json if not installed
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+RAPIDAPI_HOST = "politician-trade-tracker1.p.rapidapi.com"
+LATEST_TRADES_URL = f"https://{RAPIDAPI_HOST}/get_latest_trades"
+
+# Shared session so repeated fetches reuse the keep-alive connection instead
+# of a new TCP+TLS handshake per call; transient failures are retried with
+# backoff. The API key is sent per request since callers may pass their own.
+_SESSION = requests.Session()
+_SESSION.headers.update({"X-RapidAPI-Host": RAPIDAPI_HOST})
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+))
+
+# Concurrent yfinance lookups when mapping tickers to sectors
+SECTOR_LOOKUP_MAX_WORKERS = 16
+
+# Plausible exchange symbols (e.g. NVDA, BRK.B, BF-B); anything else would only
+# slow-fail through yfinance's retries, so it is mapped to 'Unknown' up front
+VALID_TICKER_RE = re.compile(r'^[A-Z][A-Z0-9.\-]{0,5}$')
+
+# Persistent cache of ticker -> [sector, fetched_at]. A company's sector
+# practically never changes, so lookups are reused across runs for a week;
+# failed lookups are not cached and get retried next time.
+SECTOR_CACHE_PATH = Path(__file__).parent / '.cache' / 'ticker_sectors.json'
+SECTOR_CACHE_TTL = 7 * 24 * 60 * 60
+
+# Sector cache loaded on first use and kept for the life of the process
+_sector_cache: Optional[Dict[str, list]] = None
 
 
 def get_all_recent_trades(api_key: Optional[str] = None, limit: int = 100) -> Tuple[List[Dict], Optional[str]]:
@@ -39,29 +84,34 @@ def get_all_recent_trades(api_key: Optional[str] = None, limit: int = 100) -> Tu
         return ([], "API key required. Set RAPIDAPI_KEY environment variable.")
 
     try:
-        url = "https://politician-trade-tracker1.p.rapidapi.com/get_latest_trades"
-        headers = {
-            "X-RapidAPI-Key": api_key,
-            "X-RapidAPI-Host": "politician-trade-tracker1.p.rapidapi.com"
-        }
-
-        response = requests.get(url, headers=headers, timeout=15)
+        # Host header comes from the session
+        response = _SESSION.get(LATEST_TRADES_URL, headers={"X-RapidAPI-Key": api_key}, timeout=15)
         response.raise_for_status()
 
-        all_trades_data = response.json()
+        all_trades_data = orjson.loads(response.content) if HAS_ORJSON else response.json()
 
         # Parse trades
         trades_list = all_trades_data if isinstance(all_trades_data, list) else all_trades_data.get('trades', [])
 
-        # Normalize trade data
+        # Normalize trade data. Many trades share a date, so each distinct
+        # date string is parsed once: {trade_date: (iso_date, days_old) or None}
+        now = datetime.now()
+        parsed_dates = {}
         normalized_trades = []
         for trade in trades_list[:limit]:
             # Parse date
-            try:
-                trans_date_str = trade.get('trade_date', '')
-                trans_date = datetime.strptime(trans_date_str, '%B %d, %Y')
-            except (ValueError, TypeError):
+            trans_date_str = trade.get('trade_date', '')
+            if trans_date_str not in parsed_dates:
+                try:
+                    trans_date = datetime.strptime(trans_date_str, '%B %d, %Y')
+                    parsed_dates[trans_date_str] = (trans_date.strftime('%Y-%m-%d'), (now - trans_date).days)
+                except (ValueError, TypeError):
+                    parsed_dates[trans_date_str] = None
+
+            parsed_date = parsed_dates[trans_date_str]
+            if parsed_date is None:
                 continue
+            transaction_date, days_old = parsed_date
 
             # Extract ticker (format: "TICKER:US" -> "TICKER")
             ticker_raw = trade.get('ticker', '').upper().strip()
@@ -74,17 +124,19 @@ def get_all_recent_trades(api_key: Optional[str] = None, limit: int = 100) -> Tu
             if ticker == 'N/A' or not ticker:
                 continue
 
+            transaction_type = trade.get('trade_type', 'Unknown').lower()
             normalized_trades.append({
                 'ticker': ticker,
                 'politician': trade.get('name', 'Unknown'),
                 'party': trade.get('party', 'Unknown'),
                 'chamber': trade.get('chamber', 'Unknown'),
                 'state': trade.get('state_abbreviation', trade.get('state_name', 'Unknown')),
-                'transaction_date': trans_date.strftime('%Y-%m-%d'),
-                'transaction_type': trade.get('trade_type', 'Unknown').lower(),
+                'transaction_date': transaction_date,
+                'transaction_type': transaction_type,
+                'side': trade_side(transaction_type),  # classified once for the analyzers
                 'amount': trade.get('trade_amount', 'Unknown'),
                 'company': trade.get('company', 'Unknown'),
-                'days_old': (datetime.now() - trans_date).days
+                'days_old': days_old
             })
 
         return (normalized_trades, None)
@@ -99,43 +151,39 @@ def analyze_ticker_sentiment(trades: List[Dict]) -> Dict:
 
     Returns dict with ticker sentiment analysis
     """
-    ticker_stats = defaultdict(lambda: {
-        'buys': 0,
-        'sells': 0,
-        'buyers': set(),
-        'sellers': set(),
-        'total_politicians': set(),
-        'party_breakdown': defaultdict(int),
-        'recent_buys': 0,  # Last 30 days
-        'recent_sells': 0
-    })
+    buys = Counter()
+    sells = Counter()
+    recent_buys = Counter()  # Last 30 days
+    recent_sells = Counter()
+    buyers = defaultdict(set)
+    sellers = defaultdict(set)
+    politicians = defaultdict(set)
+    party_breakdown = defaultdict(Counter)
 
     for trade in trades:
         ticker = trade['ticker']
         politician = trade['politician']
-        party = trade['party']
-        tx_type = trade['transaction_type']
-        days_old = trade['days_old']
-
-        ticker_stats[ticker]['total_politicians'].add(politician)
-        ticker_stats[ticker]['party_breakdown'][party] += 1
-
-        if 'buy' in tx_type or 'purchase' in tx_type:
-            ticker_stats[ticker]['buys'] += 1
-            ticker_stats[ticker]['buyers'].add(politician)
-            if days_old <= 30:
-                ticker_stats[ticker]['recent_buys'] += 1
-        elif 'sell' in tx_type or 'sale' in tx_type:
-            ticker_stats[ticker]['sells'] += 1
-            ticker_stats[ticker]['sellers'].add(politician)
-            if days_old <= 30:
-                ticker_stats[ticker]['recent_sells'] += 1
-
-    # Calculate sentiment scores
+        side = trade.get('side') or trade_side(trade['transaction_type'])
+
+        politicians[ticker].add(politician)
+        party_breakdown[ticker][trade['party']] += 1
+
+        if side == 'buy':
+            buys[ticker] += 1
+            buyers[ticker].add(politician)
+            if trade['days_old'] <= 30:
+                recent_buys[ticker] += 1
+        elif side == 'sell':
+            sells[ticker] += 1
+            sellers[ticker].add(politician)
+            if trade['days_old'] <= 30:
+                recent_sells[ticker] += 1
+
+    # Calculate sentiment scores (every traded ticker has a politicians entry)
     results = {}
-    for ticker, stats in ticker_stats.items():
-        net_sentiment = stats['buys'] - stats['sells']
-        total_trades = stats['buys'] + stats['sells']
+    for ticker, ticker_politicians in politicians.items():
+        net_sentiment = buys[ticker] - sells[ticker]
+        total_trades = buys[ticker] + sells[ticker]
         sentiment_ratio = net_sentiment / total_trades if total_trades > 0 else 0
 
         # Determine sentiment label
@@ -153,18 +201,18 @@ def analyze_ticker_sentiment(trades: List[Dict]) -> Dict:
         results[ticker] = {
             'ticker': ticker,
             'total_trades': total_trades,
-            'buys': stats['buys'],
-            'sells': stats['sells'],
+            'buys': buys[ticker],
+            'sells': sells[ticker],
             'net_sentiment': net_sentiment,
             'sentiment_ratio': round(sentiment_ratio, 2),
             'sentiment': sentiment,
-            'unique_politicians': len(stats['total_politicians']),
-            'unique_buyers': len(stats['buyers']),
-            'unique_sellers': len(stats['sellers']),
-            'party_breakdown': dict(stats['party_breakdown']),
+            'unique_politicians': len(ticker_politicians),
+            'unique_buyers': len(buyers.get(ticker, ())),
+            'unique_sellers': len(sellers.get(ticker, ())),
+            'party_breakdown': dict(party_breakdown[ticker]),
             'recent_activity': {
-                'buys_30d': stats['recent_buys'],
-                'sells_30d': stats['recent_sells']
+                'buys_30d': recent_buys[ticker],
+                'sells_30d': recent_sells[ticker]
             }
         }
 
@@ -172,6 +220,86 @@ def analyze_ticker_sentiment(trades: List[Dict]) -> Dict:
     return dict(sorted(results.items(), key=lambda x: x[1]['total_trades'], reverse=True))
 
 
+def _fetch_sector(ticker: str) -> Tuple[str, Optional[str]]:
+    """
+    Look up (ticker, sector) via yfinance
+
+    The sector is 'Unknown' when Yahoo has no sector for the ticker, and
+    None when the lookup itself failed (so the result isn't cached).
+    """
+    try:
+        info = yf.Ticker(ticker).info
+        # Check if we got valid data back
+        if not info:
+            return (ticker, None)
+        return (ticker, info.get('sector') or 'Unknown')
+    except Exception:
+        # Silently handle invalid tickers
+        return (ticker, None)
+
+
+def _load_sector_cache(path: Path = SECTOR_CACHE_PATH) -> Dict[str, list]:
+    """Load the persistent sector cache (empty dict if missing or unreadable)"""
+    try:
+        cache = json.loads(Path(path).read_bytes())
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_sector_cache(cache: Dict[str, list], path: Path = SECTOR_CACHE_PATH):
+    """Persist the sector cache (atomic write)"""
+    try:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(cache))
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def get_ticker_sectors(tickers) -> Dict[str, str]:
+    """
+    Map tickers to sectors, reusing cached lookups
+
+    Tickers missing from the cache (or cached more than SECTOR_CACHE_TTL
+    ago) are looked up concurrently; lookups are independent network
+    round-trips. Symbols not matching VALID_TICKER_RE are never looked up.
+
+    Returns:
+        Dict of {ticker: sector}, 'Unknown' where no sector is available
+    """
+    global _sector_cache
+    if _sector_cache is None:
+        _sector_cache = _load_sector_cache()
+
+    now = time.time()
+    ticker_sectors = {}
+    for ticker in tickers:
+        if not VALID_TICKER_RE.match(ticker):
+            ticker_sectors[ticker] = 'Unknown'
+            continue
+        entry = _sector_cache.get(ticker)
+        if entry and now - entry[1] < SECTOR_CACHE_TTL:
+            ticker_sectors[ticker] = entry[0]
+
+    missing = [ticker for ticker in tickers if ticker not in ticker_sectors]
+    if not missing:
+        return ticker_sectors
+
+    with ThreadPoolExecutor(max_workers=min(SECTOR_LOOKUP_MAX_WORKERS, len(missing))) as ex:
+        for ticker, sector in ex.map(_fetch_sector, missing):
+            if sector is None:
+                ticker_sectors[ticker] = 'Unknown'
+            else:
+                ticker_sectors[ticker] = sector
+                _sector_cache[ticker] = [sector, now]
+
+    _save_sector_cache(_sector_cache)
+    return ticker_sectors
+
+
 def analyze_sector_trends(trades: List[Dict]) -> Dict:
     """
     Aggregate congressional trading by sector
@@ -179,62 +307,45 @@ def analyze_sector_trends(trades: List[Dict]) -> Dict:
     Uses yfinance to map tickers to sectors, then analyzes sector-level sentiment
     """
     # Map tickers to sectors
-    ticker_sectors = {}
-    unique_tickers = set(t['ticker'] for t in trades)
-
-    for ticker in unique_tickers:
-        try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
-            # Check if we got valid data back
-            if not info or 'sector' not in info:
-                ticker_sectors[ticker] = 'Unknown'
-            else:
-                sector = info.get('sector', 'Unknown')
-                ticker_sectors[ticker] = sector if sector else 'Unknown'
-        except Exception as e:
-            # Silently handle invalid tickers
-            ticker_sectors[ticker] = 'Unknown'
+    ticker_sectors = get_ticker_sectors(set(t['ticker'] for t in trades))
 
     # Aggregate by sector
-    sector_stats = defaultdict(lambda: {
-        'buys': 0,
-        'sells': 0,
-        'tickers': set(),
-        'politicians': set()
-    })
+    buys = Counter()
+    sells = Counter()
+    sector_tickers = defaultdict(set)
+    sector_politicians = defaultdict(set)
 
     for trade in trades:
         ticker = trade['ticker']
         sector = ticker_sectors.get(ticker, 'Unknown')
-        tx_type = trade['transaction_type']
+        side = trade.get('side') or trade_side(trade['transaction_type'])
 
-        sector_stats[sector]['tickers'].add(ticker)
-        sector_stats[sector]['politicians'].add(trade['politician'])
+        sector_tickers[sector].add(ticker)
+        sector_politicians[sector].add(trade['politician'])
 
-        if 'buy' in tx_type or 'purchase' in tx_type:
-            sector_stats[sector]['buys'] += 1
-        elif 'sell' in tx_type or 'sale' in tx_type:
-            sector_stats[sector]['sells'] += 1
+        if side == 'buy':
+            buys[sector] += 1
+        elif side == 'sell':
+            sells[sector] += 1
 
     # Calculate sector sentiment
     results = {}
-    for sector, stats in sector_stats.items():
+    for sector, tickers in sector_tickers.items():
         if sector == 'Unknown':
             continue
 
-        total_trades = stats['buys'] + stats['sells']
-        net_sentiment = stats['buys'] - stats['sells']
+        total_trades = buys[sector] + sells[sector]
+        net_sentiment = buys[sector] - sells[sector]
 
         results[sector] = {
             'sector': sector,
             'total_trades': total_trades,
-            'buys': stats['buys'],
-            'sells': stats['sells'],
+            'buys': buys[sector],
+            'sells': sells[sector],
             'net_sentiment': net_sentiment,
-            'unique_tickers': len(stats['tickers']),
-            'unique_politicians': len(stats['politicians']),
-            'top_tickers': list(stats['tickers'])[:5]
+            'unique_tickers': len(tickers),
+            'unique_politicians': len(sector_politicians[sector]),
+            'top_tickers': list(tickers)[:5]
         }
 
     return dict(sorted(results.items(), key=lambda x: x[1]['total_trades'], reverse=True))
@@ -246,33 +357,32 @@ def analyze_party_divergence(trades: List[Dict]) -> Dict:
 
     Interesting for detecting partisan information asymmetries
     """
-    ticker_party_stats = defaultdict(lambda: {
-        'Democrat': {'buys': 0, 'sells': 0},
-        'Republican': {'buys': 0, 'sells': 0}
-    })
+    # {ticker: Counter({(party, 'buys' | 'sells'): count})}
+    party_counts = defaultdict(Counter)
 
     for trade in trades:
-        ticker = trade['ticker']
         party = trade['party']
-        tx_type = trade['transaction_type']
+        side = trade.get('side') or trade_side(trade['transaction_type'])
 
         if party not in ['Democrat', 'Republican']:
             continue
 
-        if 'buy' in tx_type or 'purchase' in tx_type:
-            ticker_party_stats[ticker][party]['buys'] += 1
-        elif 'sell' in tx_type or 'sale' in tx_type:
-            ticker_party_stats[ticker][party]['sells'] += 1
+        if side == 'buy':
+            party_counts[trade['ticker']][party, 'buys'] += 1
+        elif side == 'sell':
+            party_counts[trade['ticker']][party, 'sells'] += 1
 
     # Find divergences
     divergences = []
-    for ticker, party_data in ticker_party_stats.items():
-        dem_net = party_data['Democrat']['buys'] - party_data['Democrat']['sells']
-        rep_net = party_data['Republican']['buys'] - party_data['Republican']['sells']
+    for ticker, counts in party_counts.items():
+        dem_buys, dem_sells = counts['Democrat', 'buys'], counts['Democrat', 'sells']
+        rep_buys, rep_sells = counts['Republican', 'buys'], counts['Republican', 'sells']
+        dem_net = dem_buys - dem_sells
+        rep_net = rep_buys - rep_sells
 
         # Require at least 2 trades from each party
-        dem_total = party_data['Democrat']['buys'] + party_data['Democrat']['sells']
-        rep_total = party_data['Republican']['buys'] + party_data['Republican']['sells']
+        dem_total = dem_buys + dem_sells
+        rep_total = rep_buys + rep_sells
 
         if dem_total < 2 or rep_total < 2:
             continue
@@ -283,14 +393,42 @@ def analyze_party_divergence(trades: List[Dict]) -> Dict:
                 'ticker': ticker,
                 'democrat_sentiment': 'BUYING' if dem_net > 0 else 'SELLING',
                 'republican_sentiment': 'BUYING' if rep_net > 0 else 'SELLING',
-                'democrat_trades': f"{party_data['Democrat']['buys']} buys, {party_data['Democrat']['sells']} sells",
-                'republican_trades': f"{party_data['Republican']['buys']} buys, {party_data['Republican']['sells']} sells",
+                'democrat_trades': f"{dem_buys} buys, {dem_sells} sells",
+                'republican_trades': f"{rep_buys} buys, {rep_sells} sells",
                 'divergence_strength': abs(dem_net - rep_net)
             })
 
     return sorted(divergences, key=lambda x: x['divergence_strength'], reverse=True)
 
 
+_SUMMARY_METHODOLOGY = """METHODOLOGY:
+This analysis aggregates individual congressional trades (delayed 0-45 days by STOCK Act)
+into trend patterns. Individual delayed trades are noise; patterns across 535 members
+are signal. Focus on stocks with multiple Congress members trading in same direction."""
+
+_SUMMARY_DISCLAIMER = """INTERPRETATION GUIDE:
+- High politician count = Widespread conviction (more reliable signal)
+- Recent activity (30d) vs older = Accelerating or decelerating interest
+- Party divergence = Potential partisan information asymmetry
+- Sector accumulation = Thematic legislative positioning
+
+IMPORTANT DISCLAIMER:
+This aggregate analysis is for informational purposes only and NOT financial advice.
+Congressional trades are disclosed 0-45 days after execution. This analysis identifies
+patterns across multiple members but does not guarantee future performance.
+
+Aggregate patterns may indicate where Congress sees legislative/regulatory opportunities,
+but should be one of many factors in investment research. Consult a licensed financial
+advisor before making investment decisions."""
+
+_SECTION_RULE = "=" * 67
+
+
+def _section_header(title: str) -> str:
+    """Summary section title between horizontal rules, followed by a blank line"""
+    return f"{_SECTION_RULE}\n{title}\n{_SECTION_RULE}\n"
+
+
 def get_aggregate_analysis(api_key: Optional[str] = None) -> Dict:
     """
     Main interface for aggregate congressional trading analysis
@@ -316,60 +454,37 @@ def get_aggregate_analysis(api_key: Optional[str] = None) -> Dict:
     unique_politicians = len(set(t['politician'] for t in trades))
     unique_tickers = len(set(t['ticker'] for t in trades))
 
-    # Date range
-    dates = [datetime.strptime(t['transaction_date'], '%Y-%m-%d') for t in trades]
-    oldest_trade = min(dates).strftime('%Y-%m-%d')
-    newest_trade = max(dates).strftime('%Y-%m-%d')
+    # Date range (YYYY-MM-DD strings order chronologically)
+    dates = [t['transaction_date'] for t in trades]
+    oldest_trade = min(dates)
+    newest_trade = max(dates)
 
     # Generate summary
     analysis_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')
 
-    summary = f"""
-CONGRESSIONAL TRADING AGGREGATE ANALYSIS
-Analysis Timestamp: {analysis_time}
-Data Coverage: {newest_trade} to {oldest_trade}
-Total Trades Analyzed: {total_trades}
-Unique Politicians: {unique_politicians}
-Unique Tickers: {unique_tickers}
-
-METHODOLOGY:
-This analysis aggregates individual congressional trades (delayed 0-45 days by STOCK Act)
-into trend patterns. Individual delayed trades are noise; patterns across 535 members
-are signal. Focus on stocks with multiple Congress members trading in same direction.
-
-===================================================================
-TOP TRENDING STOCKS (By Trading Volume)
-===================================================================
-
-{_format_ticker_sentiment(ticker_sentiment, top_n=15)}
-
-===================================================================
-SECTOR TRENDS
-===================================================================
-
-{_format_sector_trends(sector_trends)}
-
-===================================================================
-PARTISAN DIVERGENCES
-===================================================================
-
-{_format_party_divergence(party_divergence)}
-
-INTERPRETATION GUIDE:
-- High politician count = Widespread conviction (more reliable signal)
-- Recent activity (30d) vs older = Accelerating or decelerating interest
-- Party divergence = Potential partisan information asymmetry
-- Sector accumulation = Thematic legislative positioning
-
-IMPORTANT DISCLAIMER:
-This aggregate analysis is for informational purposes only and NOT financial advice.
-Congressional trades are disclosed 0-45 days after execution. This analysis identifies
-patterns across multiple members but does not guarantee future performance.
-
-Aggregate patterns may indicate where Congress sees legislative/regulatory opportunities,
-but should be one of many factors in investment research. Consult a licensed financial
-advisor before making investment decisions.
-"""
+    # Assemble the summary from its sections and join once
+    parts = [
+        "CONGRESSIONAL TRADING AGGREGATE ANALYSIS",
+        f"Analysis Timestamp: {analysis_time}",
+        f"Data Coverage: {newest_trade} to {oldest_trade}",
+        f"Total Trades Analyzed: {total_trades}",
+        f"Unique Politicians: {unique_politicians}",
+        f"Unique Tickers: {unique_tickers}",
+        "",
+        _SUMMARY_METHODOLOGY,
+        "",
+        _section_header("TOP TRENDING STOCKS (By Trading Volume)"),
+        _format_ticker_sentiment(ticker_sentiment, top_n=15),
+        "",
+        _section_header("SECTOR TRENDS"),
+        _format_sector_trends(sector_trends),
+        "",
+        _section_header("PARTISAN DIVERGENCES"),
+        _format_party_divergence(party_divergence),
+        "",
+        _SUMMARY_DISCLAIMER,
+    ]
+    summary = '\n'.join(parts)
 
     return {
         "summary": summary.strip(),
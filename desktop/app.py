@@ -186,43 +186,43 @@ def full_analysis(ticker):
         agent.tools.register(Tool(
             name="get_stock_price",
             description="Get current stock price, volume, and 52-week range",
-            func=get_stock_price,
+            function=get_stock_price,
             parameters={"ticker": "Stock ticker symbol"}
         ))
         agent.tools.register(Tool(
             name="get_company_financials",
             description="Get company financial metrics",
-            func=get_company_financials,
+            function=get_company_financials,
             parameters={"ticker": "Stock ticker symbol"}
         ))
         agent.tools.register(Tool(
             name="get_analyst_ratings",
             description="Get analyst consensus ratings",
-            func=get_analyst_ratings,
+            function=get_analyst_ratings,
             parameters={"ticker": "Stock ticker symbol"}
         ))
         agent.tools.register(Tool(
             name="calculate_valuation",
             description="Calculate valuation metrics",
-            func=calculate_valuation,
+            function=calculate_valuation,
             parameters={"ticker": "Stock ticker symbol"}
         ))
         agent.tools.register(Tool(
             name="risk_assessment",
             description="Assess investment risk",
-            func=risk_assessment,
+            function=risk_assessment,
             parameters={"ticker": "Stock ticker symbol"}
         ))
         agent.tools.register(Tool(
             name="analyze_technicals",
             description="Technical analysis",
-            func=analyze_technicals,
+            function=analyze_technicals,
             parameters={"ticker": "Stock ticker symbol"}
         ))
         agent.tools.register(Tool(
             name="analyze_news_sentiment",
             description="News sentiment analysis",
-            func=analyze_news_sentiment,
+            function=analyze_news_sentiment,
             parameters={"ticker": "Stock ticker symbol"}
         ))
 
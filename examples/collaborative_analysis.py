@@ -144,7 +144,7 @@ def main():
     import json
     output_file = "collaborative_analysis_results.json"
     with open(output_file, 'w') as f:
-        json.dump(result, f, indent=2)
+        json.dump(dict(result), f, indent=2)
 
     print(f"\n\nFull results saved to: {output_file}")
     print("\nThis collaborative recommendation combines:")
@@ -33,7 +33,7 @@ load_dotenv()
 
 from order_executor import OrderExecutor
 from risk_manager import RiskManager
-from autoinvestor_api import get_correlation, get_sectors
+from autoinvestor_api import get_correlation, get_sectors, _write_json_fast
 from overnight_scanner import OvernightScanner
 
 # Import strategy trigger for VIX-based reviews
@@ -417,8 +417,7 @@ class ExecutionMonitor:
                 'status': 'pending'
             }
 
-            with open('scheduled_review_needed.json', 'w') as f:
-                json.dump(alert, f, indent=2, default=str)
+            _write_json_fast('scheduled_review_needed.json', alert)
 
             logger.info("")
             logger.info("=" * 70)
@@ -1709,8 +1708,7 @@ Run /strategy-review to execute rotation exit."""
 
             # Write alert to file
             alert_file = 'strategy_review_needed.json'
-            with open(alert_file, 'w') as f:
-                json.dump(alert, f, indent=2)
+            _write_json_fast(alert_file, alert)
 
             logger.info(f"VIX: {self.previous_vix:.2f} ({self.previous_vix_regime}) -> {vix_level:.2f} ({regime})")
             logger.info(f"Alert written to: {alert_file}")
@@ -2053,8 +2051,7 @@ Run /strategy-review to execute rotation exit."""
 
             # Write alert to file
             alert_file = 'scheduled_review_needed.json'
-            with open(alert_file, 'w') as f:
-                json.dump(alert, f, indent=2)
+            _write_json_fast(alert_file, alert)
 
             logger.info(f"Review interval: Every {self.review_interval_hours} hours")
             logger.info(f"Alert written to: {alert_file}")
@@ -15,6 +15,8 @@ Author: Lyra & Thomas
 Version: 1.0.0 - 2025-11-23
 """
 
+import time
+import threading
 import yfinance as yf
 import pandas as pd
 import numpy as np
@@ -22,6 +24,51 @@ from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 
 
+# Daily closes cached per (ticker, period) so overlapping ticker sets only
+# download the symbols not seen yet. Entries expire after CLOSES_CACHE_TTL seconds.
+CLOSES_CACHE_TTL = 3600
+
+_closes_cache: Dict[tuple, tuple] = {}
+_closes_cache_lock = threading.Lock()
+
+
+def _get_closes(tickers: List[str], period: str) -> pd.DataFrame:
+    """
+    Get daily closing prices for tickers, one column per ticker
+
+    Cached series are reused; all missing tickers are fetched together in a
+    single threaded yf.download call. Tickers with no data are omitted.
+    """
+    now = time.monotonic()
+    cached = {}
+    with _closes_cache_lock:
+        for ticker in tickers:
+            hit = _closes_cache.get((ticker, period))
+            if hit is not None and now - hit[0] < CLOSES_CACHE_TTL:
+                cached[ticker] = hit[1]
+
+    missing = [t for t in tickers if t not in cached]
+    if missing:
+        data = yf.download(missing, period=period, progress=False, threads=True)
+        if not data.empty:
+            closes = data['Close']
+            if isinstance(closes, pd.Series):
+                closes = closes.to_frame(name=missing[0])
+
+            with _closes_cache_lock:
+                for ticker in missing:
+                    if ticker in closes.columns:
+                        series = closes[ticker].dropna()
+                        if not series.empty:
+                            cached[ticker] = series
+                            _closes_cache[(ticker, period)] = (now, series)
+
+    columns = [cached[t] for t in tickers if t in cached]
+    if not columns:
+        return pd.DataFrame()
+    return pd.concat(columns, axis=1, keys=[t for t in tickers if t in cached])
+
+
 def analyze_portfolio_correlation(tickers: List[str], period: str = "1y") -> Dict:
     """
     Main interface for portfolio correlation analysis
@@ -140,19 +187,12 @@ def get_portfolio_metrics(tickers: List[str], period: str = "1y") -> Dict:
         # Clean tickers
         tickers = [t.upper().strip() for t in tickers]
 
-        # Download historical data
-        data = yf.download(tickers, period=period, progress=False)
+        # Get historical closing prices (cached per ticker)
+        closes = _get_closes(tickers, period)
 
-        if data.empty:
+        if closes.empty:
             return {"error": "No data available for the specified tickers"}
 
-        # Get closing prices
-        if len(tickers) == 1:
-            closes = data['Close'].to_frame()
-            closes.columns = [tickers[0]]
-        else:
-            closes = data['Close']
-
         # Remove any tickers with insufficient data
         closes = closes.dropna(axis=1, how='all')
         valid_tickers = closes.columns.tolist()
@@ -164,8 +204,8 @@ def get_portfolio_metrics(tickers: List[str], period: str = "1y") -> Dict:
         returns = closes.pct_change().dropna()
 
         # Download S&P 500 for beta calculation
-        spy_data = yf.download("^GSPC", period=period, progress=False)
-        market_returns = spy_data['Close'].pct_change().dropna()
+        spy_closes = _get_closes(["^GSPC"], period)
+        market_returns = spy_closes["^GSPC"].pct_change().dropna() if not spy_closes.empty else pd.Series(dtype=float)
 
         # Calculate correlation matrix
         correlation_matrix = returns.corr()
@@ -5,7 +5,6 @@ Follows the protocol defined in skills/strategy-review.md
 """
 
 import json
-from pathlib import Path
 from datetime import datetime
 from dotenv import load_dotenv
 
@@ -20,7 +19,9 @@ from autoinvestor_api import (
     get_correlation,
     get_sectors,
     execute_order,
-    get_market_status
+    get_market_status,
+    _read_json_fast,
+    _write_json_fast
 )
 
 def load_alert():
@@ -31,15 +32,15 @@ def load_alert():
     ]
 
     for filename, alert_type in alert_files:
-        path = Path(filename)
-        if path.exists():
-            with open(path) as f:
-                alert = json.load(f)
-            if alert.get('status') == 'pending':
-                print(f"\n{'='*70}")
-                print(f"Processing {alert_type}: {alert.get('reason', 'Review needed')}")
-                print(f"{'='*70}\n")
-                return filename, alert, alert_type
+        try:
+            alert = _read_json_fast(filename)
+        except FileNotFoundError:
+            continue
+        if alert.get('status') == 'pending':
+            print(f"\n{'='*70}")
+            print(f"Processing {alert_type}: {alert.get('reason', 'Review needed')}")
+            print(f"{'='*70}\n")
+            return filename, alert, alert_type
 
     return None, None, None
 
@@ -569,8 +570,7 @@ def update_alert(filename, alert, decision, reason, trades):
     alert['decision'] = f"{decision}: {reason}"
     alert['executed_trades'] = trades
 
-    with open(filename, 'w') as f:
-        json.dump(alert, f, indent=2)
+    _write_json_fast(filename, alert)
 
     print(f"\n[OK] Alert updated: {filename}")
 
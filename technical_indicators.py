@@ -16,11 +16,50 @@ import numpy as np
 from typing import Dict, Optional
 from datetime import datetime, timedelta
 
+# Optional JIT for the EMA recursion (pandas ewm is used otherwise)
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
 # Bollinger Bands volatility thresholds
 BOLLINGER_NARROW_BANDWIDTH = 10  # Below this = low volatility, potential breakout
 BOLLINGER_WIDE_BANDWIDTH = 20    # Above this = high volatility
 
 
+def _ema_loop(values: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    EMA recursion equivalent to pandas ewm(adjust=False) on gap-free data
+
+    NaNs carry the previous average forward; leading NaNs stay NaN.
+    """
+    out = np.empty_like(values)
+    prev = np.nan
+    for i in range(len(values)):
+        value = values[i]
+        if np.isnan(value):
+            out[i] = prev
+        elif np.isnan(prev):
+            prev = value
+            out[i] = value
+        else:
+            prev = alpha * value + (1.0 - alpha) * prev
+            out[i] = prev
+    return out
+
+
+if HAS_NUMBA:
+    _ema_loop = njit(cache=True)(_ema_loop)
+
+
+def _ema(values: np.ndarray, span: int) -> np.ndarray:
+    """Exponential moving average of a float array (span convention as pandas)"""
+    if HAS_NUMBA:
+        return _ema_loop(values, 2.0 / (span + 1))
+    return pd.Series(values).ewm(span=span, adjust=False).mean().to_numpy()
+
+
 def get_technical_indicators(ticker: str, period: str = "6mo") -> Dict:
     """
     Calculate comprehensive technical indicators for a stock
@@ -80,13 +119,14 @@ def calculate_sma(hist: pd.DataFrame, periods: list = [20, 50, 200]) -> Dict:
     Returns:
         Dict with SMA values and signals
     """
-    close = hist['Close']
-    current_price = close.iloc[-1]
+    close = hist['Close'].to_numpy(dtype=float)
+    current_price = close[-1]
 
     smas = {}
     for period in periods:
         if len(close) >= period:
-            sma_value = close.rolling(window=period).mean().iloc[-1]
+            # Only the latest average is used, so average the last window directly
+            sma_value = float(close[-period:].mean())
             smas[f'sma_{period}'] = round(sma_value, 2)
 
             # Calculate distance from current price
@@ -131,32 +171,26 @@ def calculate_rsi(hist: pd.DataFrame, period: int = 14) -> Dict:
     Returns:
         Dict with RSI value and interpretation
     """
-    close = hist['Close']
+    close = hist['Close'].to_numpy(dtype=float)
 
-    # Calculate price changes
-    delta = close.diff()
+    # Handle insufficient data for RSI calculation
+    if len(close) < period:
+        return {
+            "error": f"Insufficient data to calculate RSI. Need at least {period} days of price history."
+        }
 
-    # Separate gains and losses
-    gains = delta.where(delta > 0, 0)
-    losses = -delta.where(delta < 0, 0)
+    # Price changes over the latest window (first day has no change)
+    delta = np.diff(close[-(period + 1):], prepend=np.nan)[-period:]
+    delta = np.nan_to_num(delta, nan=0.0)
 
-    # Calculate average gains and losses
-    avg_gains = gains.rolling(window=period).mean()
-    avg_losses = losses.rolling(window=period).mean()
+    # Average gains and losses
+    avg_gain = np.where(delta > 0, delta, 0.0).mean()
+    avg_loss = np.where(delta < 0, -delta, 0.0).mean()
 
     # Calculate RS and RSI
     # Prevent division by zero if stock only has gains (no losses)
-    avg_losses_safe = avg_losses.replace(0, 1e-10)
-    rs = avg_gains / avg_losses_safe
-    rsi = 100 - (100 / (1 + rs))
-
-    current_rsi = rsi.iloc[-1]
-
-    # Handle NaN case (insufficient data for RSI calculation)
-    if pd.isna(current_rsi):
-        return {
-            "error": f"Insufficient data to calculate RSI for {ticker}. Need at least {period} days of price history."
-        }
+    rs = avg_gain / (avg_loss if avg_loss != 0 else 1e-10)
+    current_rsi = float(100 - (100 / (1 + rs)))
 
     # Interpret RSI
     if current_rsi >= 70:
@@ -195,30 +229,30 @@ def calculate_macd(hist: pd.DataFrame,
     Returns:
         Dict with MACD values and signals
     """
-    close = hist['Close']
+    close = hist['Close'].to_numpy(dtype=float)
 
     # Calculate EMAs
-    ema_fast = close.ewm(span=fast, adjust=False).mean()
-    ema_slow = close.ewm(span=slow, adjust=False).mean()
+    ema_fast = _ema(close, fast)
+    ema_slow = _ema(close, slow)
 
     # Calculate MACD line
     macd_line = ema_fast - ema_slow
 
     # Calculate signal line
-    signal_line = macd_line.ewm(span=signal, adjust=False).mean()
+    signal_line = _ema(macd_line, signal)
 
     # Calculate histogram
     histogram = macd_line - signal_line
 
     # Get current values
-    current_macd = macd_line.iloc[-1]
-    current_signal = signal_line.iloc[-1]
-    current_histogram = histogram.iloc[-1]
+    current_macd = float(macd_line[-1])
+    current_signal = float(signal_line[-1])
+    current_histogram = float(histogram[-1])
 
     # Detect crossovers (check last 5 periods for recent crossover)
     recent_periods = 5
-    macd_recent = macd_line.iloc[-recent_periods:]
-    signal_recent = signal_line.iloc[-recent_periods:]
+    macd_recent = macd_line[-recent_periods:]
+    signal_recent = signal_line[-recent_periods:]
 
     signals = []
 
@@ -238,10 +272,10 @@ def calculate_macd(hist: pd.DataFrame,
 
     # Check for recent crossover
     for i in range(1, len(macd_recent)):
-        if macd_recent.iloc[i] > signal_recent.iloc[i] and macd_recent.iloc[i-1] <= signal_recent.iloc[i-1]:
+        if macd_recent[i] > signal_recent[i] and macd_recent[i-1] <= signal_recent[i-1]:
             signals.append("RECENT: Bullish crossover detected")
             break
-        elif macd_recent.iloc[i] < signal_recent.iloc[i] and macd_recent.iloc[i-1] >= signal_recent.iloc[i-1]:
+        elif macd_recent[i] < signal_recent[i] and macd_recent[i-1] >= signal_recent[i-1]:
             signals.append("RECENT: Bearish crossover detected")
             break
 
@@ -268,23 +302,20 @@ def calculate_bollinger_bands(hist: pd.DataFrame,
     Returns:
         Dict with Bollinger Bands values and signals
     """
-    close = hist['Close']
-
-    # Calculate middle band (SMA)
-    middle_band = close.rolling(window=period).mean()
+    close = hist['Close'].to_numpy(dtype=float)
 
-    # Calculate standard deviation
-    std = close.rolling(window=period).std()
+    # Only the latest bands are reported, so use the last window directly
+    if len(close) >= period:
+        window = close[-period:]
+        current_middle = float(window.mean())
+        std = float(window.std(ddof=1))
+    else:
+        current_middle = std = np.nan
 
     # Calculate upper and lower bands
-    upper_band = middle_band + (std * std_dev)
-    lower_band = middle_band - (std * std_dev)
-
-    # Get current values
-    current_price = close.iloc[-1]
-    current_upper = upper_band.iloc[-1]
-    current_middle = middle_band.iloc[-1]
-    current_lower = lower_band.iloc[-1]
+    current_upper = current_middle + (std * std_dev)
+    current_lower = current_middle - (std * std_dev)
+    current_price = float(close[-1])
 
     # Calculate bandwidth and %B
     bandwidth = ((current_upper - current_lower) / current_middle) * 100
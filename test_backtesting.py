@@ -0,0 +1,118 @@
+"""
+Test Backtesting Statistics
+
+Tests (offline - no network requests):
+1. Trades too recent for any window flow from calculate_trade_returns
+   through calculate_backtest_statistics
+2. Best/worst trade lists don't overlap with fewer than 2 * top_k trades
+3. A second backtest over a warm price cache still prices every trade
+"""
+
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import backtesting
+from backtesting import calculate_trade_returns, calculate_backtest_statistics
+
+WINDOWS = [30, 60, 90]
+
+
+def _price_frame(start: datetime, closes: list):
+    """PriceFrame of daily closes starting at start"""
+    dates = np.array([np.datetime64((start + timedelta(days=i)).date(), 'D')
+                      for i in range(len(closes))])
+    return dates, np.asarray(closes, dtype=float)
+
+
+def test_recent_trade_statistics():
+    """A skipped (too recent) trade doesn't break the statistics"""
+    old_date = datetime.now() - timedelta(days=200)
+    frames = {'OLD': _price_frame(old_date, [100.0 + i for i in range(120)])}
+
+    trades = [
+        {'ticker': 'OLD', 'politician': 'Rep A', 'transaction_type': 'purchase',
+         'transaction_date': old_date.strftime('%Y-%m-%d')},
+        {'ticker': 'NEW', 'politician': 'Rep B', 'transaction_type': 'sale',
+         'transaction_date': (datetime.now() - timedelta(days=5)).strftime('%Y-%m-%d')},
+    ]
+
+    results = [calculate_trade_returns(t, WINDOWS, price_frames=frames) for t in trades]
+    results = [r for r in results if 'error' not in r]
+
+    assert len(results) == 2
+    skipped = results[1]
+    assert skipped['skipped'] == 'future'
+    assert skipped['transaction_type'] == 'sale'
+    assert skipped['entry_price'] is None
+
+    stats = calculate_backtest_statistics(results, {}, WINDOWS)
+    assert stats['30d']['trade_count'] == 1
+    assert stats['30d']['best_trade']['ticker'] == 'OLD'
+    print("[PASS] Recent trade skipped without breaking statistics")
+
+
+def test_best_worst_lists_disjoint():
+    """Best and worst lists split the trades instead of sharing them"""
+    returns = [12.0, 4.0, -3.0, -9.0, 1.0]
+    results = [
+        {'ticker': f'T{i}', 'politician': 'Rep', 'transaction_type': 'purchase',
+         'returns': {'30d': r}}
+        for i, r in enumerate(returns)
+    ]
+
+    stats = calculate_backtest_statistics(results, {}, [30], top_k=5)['30d']
+    best = [t['return'] for t in stats['top_trades']]
+    worst = [t['return'] for t in stats['bottom_trades']]
+
+    assert best == [12.0, 4.0]
+    assert worst == [-9.0, -3.0]
+    print("[PASS] Best/worst lists don't overlap")
+
+
+
+def _fake_download(tickers, start, end, **kwargs):
+    """yf.download stand-in: daily closes rising by 1 per day for each ticker"""
+    index = pd.date_range(start.date(), end.date(), freq='D', inclusive='left')
+    closes = 100.0 + np.arange(len(index))
+    return pd.concat({t: pd.DataFrame({'Close': closes}, index=index) for t in tickers}, axis=1)
+
+
+def test_warm_cache_backtest():
+    """Trades whose prices are all cached still get priced on the next run"""
+    cache_path = Path(tempfile.mkdtemp()) / 'prices.json'
+    originals = (backtesting.yf.download, backtesting._fetch_frame,
+                 backtesting.load_price_cache, backtesting.save_price_cache)
+    backtesting.yf.download = _fake_download
+    backtesting._fetch_frame = lambda ticker, start, end: None  # no network fallback
+    backtesting.load_price_cache = lambda: originals[2](cache_path)
+    backtesting.save_price_cache = lambda cache: originals[3](cache, cache_path)
+
+    def trade(days_ago):
+        return {'ticker': 'AAA', 'politician': 'Rep', 'transaction_type': 'purchase',
+                'transaction_date': (datetime.now() - timedelta(days=days_ago)).strftime('%Y-%m-%d')}
+
+    try:
+        first = backtesting.backtest_congressional_trades([trade(300)], WINDOWS, verbose=False)
+        assert first['total_trades_analyzed'] == 1
+
+        # The first trade (and its SPY rows) is now fully cached, so the
+        # prefetch only covers the new trade's dates
+        second = backtesting.backtest_congressional_trades([trade(300), trade(200)],
+                                                           WINDOWS, verbose=False)
+        assert second['total_trades_analyzed'] == 2
+        assert second['statistics']['30d']['benchmark_avg'] != 0
+        assert second['individual_trades'][0] == first['individual_trades'][0]
+    finally:
+        (backtesting.yf.download, backtesting._fetch_frame,
+         backtesting.load_price_cache, backtesting.save_price_cache) = originals
+    print("[PASS] Warm-cache backtest prices every trade")
+
+
+if __name__ == "__main__":
+    test_recent_trade_statistics()
+    test_best_worst_lists_disjoint()
+    test_warm_cache_backtest()